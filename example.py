@@ -20,30 +20,26 @@ class Cet(datetime.timezone):
         return dt
 
     def dst(self, dt) -> datetime.timedelta:
-        return datetime.timedelta(hours=1) if self.isdst(dt)\
+        return datetime.timedelta(hours=1) if self.isdst(dt)[0]\
             else datetime.timedelta(0)
 
     def tzname(self, dt) -> str:
-        return 'CEST' if self.isdst(dt) else 'CET'
+        return 'CEST' if self.isdst(dt)[0] else 'CET'
 
     def isdst(self, dt, utc=False) -> bool:
         if dt is None:
             return False, None
 
         year = dt.year
-        if not 2000 <= year < 2100:
-            # Formulas below are valid in the range [2000; 2100)
-            raise ValueError
-
         hour = 1 if utc else 3
-        day = 31 - (5 * year // 4 + 4) % 7  # last Sunday of March
-        beg = datetime.datetime(year, 3, day, hour)
-        day = 31 - (5 * year // 4 + 1) % 7  # last Sunday of October
-        end = datetime.datetime(year, 10, day, hour)
+        day = 31 - (datetime.date(year, 3, 31).weekday() + 1) % 7
+        beg = datetime.datetime(year, 3, day, hour)  # last Sunday of March
+        day = 31 - (datetime.date(year, 10, 31).weekday() + 1) % 7
+        end = datetime.datetime(year, 10, day, hour)  # last Sunday of October
 
         dt = dt.replace(tzinfo=None)
         if utc:
-            fold = 1 if end <= dt < end + timedelta(hours=1) else 0
+            fold = 1 if end <= dt < end + datetime.timedelta(hours=1) else 0
         else:
             fold = dt.fold
         isdst = beg <= dt < end
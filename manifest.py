@@ -0,0 +1,26 @@
+# manifest.py
+#
+# Freeze the whole library into a MicroPython firmware by including this file
+# from the board manifest:
+#   include("path/to/micropython-suntime/manifest.py")
+# Use `suntime-manifest.py` or `sundatetime-manifest.py` for one
+# implementation only.
+
+metadata(description="Sunrise and sunset computation", version="1.0.0")
+
+require("datetime")
+package("suntime", files=(
+    "__init__.py",
+    "batch.py",
+    "cache.py",
+    "fast.py",
+    "instrument.py",
+    "noaa.py",
+    "position.py",
+    "fixed.py",
+    "scheduler.py",
+    "sundatetime.py",
+    "siteset.py",
+    "suntable.py",
+    "suntime.py",
+))
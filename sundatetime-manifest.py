@@ -0,0 +1,15 @@
+# sundatetime-manifest.py
+#
+# Freeze class `Sundatetime` only, see `manifest.py`.
+
+metadata(description="Sunrise and sunset computation", version="1.0.0")
+
+require("datetime")
+package("suntime", files=(
+    "__init__.py",
+    "cache.py",
+    "fast.py",
+    "instrument.py",
+    "noaa.py",
+    "sundatetime.py",
+))
@@ -0,0 +1,18 @@
+# suntime-manifest.py
+#
+# Freeze class `Suntime` only (no `datetime`), see `manifest.py`.
+
+metadata(description="Sunrise and sunset computation", version="1.0.0")
+
+package("suntime", files=(
+    "__init__.py",
+    "cache.py",
+    "fast.py",
+    "instrument.py",
+    "noaa.py",
+    "position.py",
+    "fixed.py",
+    "siteset.py",
+    "suntable.py",
+    "suntime.py",
+))
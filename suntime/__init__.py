@@ -4,6 +4,27 @@ __version__ = "1.0.0"
 from math import acos, asin, cos, degrees as deg, fmod as mod,\
                  sqrt, radians as rad, sin
 
+SINε = sin(rad(23.44)) # obliquity of the ecliptic
+ΔM = 0.98560028 # daily motion of mean anomaly
+SINΔM = sin(rad(ΔM))
+COSΔM = cos(rad(ΔM))
+STEPS = 32 # days stepped by `Site.step` before recomputing M from scratch
+
+# solar elevation angles (degrees) for sunrise/sunset and twilights
+HORIZON = -0.83
+CIVIL = -6
+NAUTICAL = -12
+ASTRONOMICAL = -18
+
+# days since 2000-01-01 accepted by solvers: years [1600; 2400)
+FIRST_DAY = -146097
+LAST_DAY = 146097 # excluded
+
+# states of a day, see `day_state`
+NORMAL = 0
+POLAR_DAY = 1
+POLAR_NIGHT = -1
+
 # https://en.wikipedia.org/wiki/Sunrise_equation
 # https://en.wikipedia.org/wiki/Julian_day
 #  m = round((M - 14)/12)
@@ -11,15 +32,24 @@ from math import acos, asin, cos, degrees as deg, fmod as mod,\
 #      + round((367*(M - 2 - 12*m))/12)\
 #      - round((3*(round((Y + 4900 + m)/100)))/4)\
 #      + D - 32075
-def equation (n: int, lat: float, lon: float, alt: float) -> tuple[float, float]:
+def transit(
+    n: int,
+    lon: float,
+) -> tuple[float, float]:
+    # Return the Julian date of solar transit of day *n* and `sin(δ)` then,
+    # the part of `equation` which does not depend on latitude and altitude.
     #  n = ceil(Jd - 2451545.0 + 0.0008)
-    assert(0 <= n < 36525) # days in 21st century
+    assert(FIRST_DAY <= n < LAST_DAY)
     Js = n - lon/360
     M = mod(357.5291 + 0.98560028*Js, 360)
-    C = 1.9148*sin(rad(M)) + 0.0200*sin(rad(2*M)) + 0.0003*sin(rad(3*M))
+    sinM = sin(rad(M))
+    C = 1.9148*sinM + 0.0200*sin(rad(2*M)) + 0.0003*sin(rad(3*M))
     λ = mod(M + C + 180 + 102.9372, 360)
-    Jt = 2451545.0 + Js + 0.0053*sin(rad(M)) - 0.0069*sin(rad(2*λ))
-    sinδ = sin(rad(λ))*sin(rad(23.44))
+    Jt = 2451545.0 + Js + 0.0053*sinM - 0.0069*sin(rad(2*λ))
+    return Jt, sin(rad(λ))*SINε
+
+def equation (n: int, lat: float, lon: float, alt: float) -> tuple[float, float]:
+    Jt, sinδ = transit(n, lon)
     cosω0 = (sin(rad(-0.83 - 2.076*sqrt(alt)/60)) - sin(rad(lat))*sinδ)\
           / (cos(rad(lat))*cos(asin(sinδ)))
     if cosω0 <= -1.0:
@@ -32,7 +62,227 @@ def equation (n: int, lat: float, lon: float, alt: float) -> tuple[float, float]
     Js = Jt + ω0/360
     return Jr, Js
 
+def equation_angles (
+    n: int,
+    lat: float,
+    lon: float,
+    alt: float,
+    angles: tuple[float, ...]=(HORIZON, CIVIL, NAUTICAL, ASTRONOMICAL),
+) -> list[tuple[float, float]]:
+    # Same as `equation`, for each of the solar elevation *angles*: the
+    # position of Sun is computed once. Altitude corrects for the dip of
+    # the horizon in all cases.
+    Jt, sinδ = transit(n, lon)
+    sinφδ = sin(rad(lat))*sinδ
+    cosφδ = cos(rad(lat))*cos(asin(sinδ))
+    dip = 2.076*sqrt(alt)/60
+    results = []
+    for h in angles:
+        cosω0 = (sin(rad(h - dip)) - sinφδ) / cosφδ
+        if cosω0 <= -1.0:
+            ω0 = 360
+        elif cosω0 >= 1.0:
+            ω0 = -360
+        else:
+            ω0 = deg(acos(cosω0))
+        results.append((Jt - ω0/360, Jt + ω0/360))
+    return results
+
+def day_state(Jr: float, Js: float) -> int:
+    # `NORMAL` if Sun rises and sets, `POLAR_DAY` or `POLAR_NIGHT` if the
+    # equation clamped `cosω0` (ω0 = ±360°).
+    d = Js - Jr # ω0/180: ±2 when cosω0 is clamped
+    return NORMAL if -1.5 < d < 1.5 else POLAR_DAY if d > 0 else POLAR_NIGHT
+
 def jdate2time (Jd: float, n: int, tz: int=0) -> int:
     jtime = Jd - (2451545 + n)
     minutes = round(jtime*1440) + 720 + tz
     return minutes
+
+class Site:
+    # Same as `equation`, with terms depending only on the place computed
+    # once. Results are stored in `Jr` and `Js` rather than returned.
+    __slots__ = ('lon', 'sinφ', 'cosφ', 'sinh0', 'Jr', 'Js',
+                 '_n', '_steps', '_M', '_sinM', '_cosM')
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        alt: float=0,
+    ) -> None:
+        self.lon: float = lon
+        self.sinφ: float = sin(rad(lat))
+        self.cosφ: float = cos(rad(lat))
+        self.sinh0: float = sin(rad(-0.83 - 2.076*sqrt(alt)/60))
+        self.Jr: float = 0.0
+        self.Js: float = 0.0
+        self._n: int = -2 # last day of `step`
+        self._steps: int = 0
+        self._M: float = 0.0
+        self._sinM: float = 0.0
+        self._cosM: float = 0.0
+
+    def solve(
+        self,
+        n: int,
+    ) -> None:
+        # Same terms as `transit`, inlined so that no tuple is built.
+        assert(FIRST_DAY <= n < LAST_DAY)
+        Js = n - self.lon/360
+        M = mod(357.5291 + 0.98560028*Js, 360)
+        sinM = sin(rad(M))
+        C = 1.9148*sinM + 0.0200*sin(rad(2*M)) + 0.0003*sin(rad(3*M))
+        λ = mod(M + C + 180 + 102.9372, 360)
+        Jt = 2451545.0 + Js + 0.0053*sinM - 0.0069*sin(rad(2*λ))
+        sinδ = sin(rad(λ))*SINε
+        cosω0 = (self.sinh0 - self.sinφ*sinδ) / (self.cosφ*cos(asin(sinδ)))
+        if cosω0 <= -1.0:
+            ω0 = 360
+        elif cosω0 >= 1.0:
+            ω0 = -360
+        else:
+            ω0 = deg(acos(cosω0))
+        self.Jr = Jt - ω0/360
+        self.Js = Jt + ω0/360
+
+    def step(
+        self,
+        n: int,
+    ) -> None:
+        # Same as `solve`. If called for consecutive days, M is advanced by
+        # rotating its sine and cosine; M is recomputed from scratch every
+        # `STEPS` days to bound the drift.
+        assert(FIRST_DAY <= n < LAST_DAY)
+        Js = n - self.lon/360
+        if n != self._n + 1 or self._steps == 0:
+            M = mod(357.5291 + 0.98560028*Js, 360)
+            sinM = sin(rad(M))
+            cosM = cos(rad(M))
+            self._steps = STEPS
+        else:
+            M = self._M + ΔM
+            if M >= 360:
+                M -= 360
+            sinM = self._sinM*COSΔM + self._cosM*SINΔM
+            cosM = self._cosM*COSΔM - self._sinM*SINΔM
+            self._steps -= 1
+        self._n = n
+        self._M = M
+        self._sinM = sinM
+        self._cosM = cosM
+        sin2M = 2*sinM*cosM
+        sin3M = sinM*(3 - 4*sinM*sinM)
+        C = 1.9148*sinM + 0.0200*sin2M + 0.0003*sin3M
+        λ = mod(M + C + 180 + 102.9372, 360)
+        sinλ = sin(rad(λ))
+        Jt = 2451545.0 + Js + 0.0053*sinM - 0.0069*sin(rad(2*λ))
+        sinδ = sinλ*SINε
+        cosω0 = (self.sinh0 - self.sinφ*sinδ)\
+              / (self.cosφ*sqrt(1 - sinδ*sinδ))
+        if cosω0 <= -1.0:
+            ω0 = 360
+        elif cosω0 >= 1.0:
+            ω0 = -360
+        else:
+            ω0 = deg(acos(cosω0))
+        self.Jr = Jt - ω0/360
+        self.Js = Jt + ω0/360
+
+def seek(
+    solve,
+    n: int,
+    step: int,
+) -> int|None:
+    # Return the first day from *n* onwards (*step* = 1) or backwards
+    # (*step* = -1) when Sun both rises and sets, `None` if out of range.
+    # *solve(n)* returns the same as `equation`. Polar days and nights are
+    # skipped by doubling the step and then bisecting.
+    def state(n: int) -> int:
+        return day_state(*solve(n))
+    if not FIRST_DAY <= n < LAST_DAY:
+        return None
+    s0 = state(n)
+    while s0 != NORMAL:
+        a = n
+        k = 1
+        while True:
+            b = min(max(a + k*step, FIRST_DAY), LAST_DAY - 1)
+            if b == a:
+                return None
+            s = state(b)
+            if s != s0:
+                break
+            a = b
+            k *= 2
+        while abs(b - a) > 1:
+            m = (a + b)//2
+            if state(m) == s0:
+                a = m
+            else:
+                b = m
+        n = b
+        s0 = state(n)
+    return n
+
+def polar_span(
+    solve,
+    n: int,
+) -> tuple[int, int]|None:
+    # Return `(first, last)`, both included, of the polar day or night
+    # around day *n*, `None` if Sun rises and sets on day *n*. *solve* is
+    # the same as in `seek`; spans are clipped to the supported range.
+    if day_state(*solve(n)) == NORMAL:
+        return None
+    first = seek(solve, n, -1)
+    last = seek(solve, n, 1)
+    return FIRST_DAY if first is None else first + 1,\
+           LAST_DAY - 1 if last is None else last - 1
+
+def find_event(
+    solve,
+    now: int,
+    tz: int=0,
+    step: int=1,
+) -> tuple[int, float, bool]|None:
+    # Return `(n, Jd, rising)` for the first sunrise or sunset after *now*
+    # (*step* = 1) or the last one not after *now* (*step* = -1), where *now*
+    # is the number of minutes since 2000-01-01 00:00 in time zone *tz*. *n*
+    # is the day whose equation gives Julian date *Jd*.
+    n = now//1440 - step
+    while True:
+        n = seek(solve, max(min(n, LAST_DAY - 1), FIRST_DAY), step)
+        if n is None:
+            return None
+        Jr, Js = solve(n)
+        events = ((Jr, True), (Js, False))
+        for Jd, rising in events if step > 0 else reversed(events):
+            t = n*1440 + jdate2time(Jd, n, tz)
+            if (t > now) if step > 0 else (t <= now):
+                return n, Jd, rising
+        n += step
+        if not FIRST_DAY <= n < LAST_DAY:
+            return None
+
+# Classes (and `stats()`) are imported from their module on first access,
+# e.g. `suntime.Suntime`, so that `import suntime` loads neither `datetime` nor
+# unused implementations.
+LAZY = {
+    'Scheduler': 'scheduler',
+    'SiteSet': 'siteset',
+    'SolarPosition': 'position',
+    'SunCache': 'cache',
+    'SunService': 'service',
+    'Sundatetime': 'sundatetime',
+    'SunTable': 'suntable',
+    'Suntime': 'suntime',
+    'stats': 'instrument',
+}
+
+def __getattr__(name: str):
+    module = LAZY.get(name)
+    if module is None:
+        raise AttributeError(name)
+    value = getattr(__import__('suntime.' + module, None, None, (name,)), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,70 @@
+# batch.py
+
+from array import array
+from . import FIRST_DAY, LAST_DAY, SINε, equation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _column(x, size: int):
+    if isinstance(x, (int, float)):
+        return (x,)*size
+    if len(x) == 1:
+        return (x[0],)*size
+    assert(len(x) == size)
+    return x
+
+def _size(*args) -> int:
+    size = 1
+    for x in args:
+        if not isinstance(x, (int, float)) and len(x) != 1:
+            size = len(x)
+    return size
+
+def equation_array(n, lat, lon, alt=0) -> tuple[array, array]:
+    # `equation` looped over `array` columns, hence the same results.
+    size = _size(n, lat, lon, alt)
+    n = _column(n, size)
+    lat = _column(lat, size)
+    lon = _column(lon, size)
+    alt = _column(alt, size)
+    Jr = array('d')
+    Js = array('d')
+    for i in range(size):
+        r, s = equation(n[i], lat[i], lon[i], alt[i])
+        Jr.append(r)
+        Js.append(s)
+    return Jr, Js
+
+def equation_numpy(n, lat, lon, alt=0):
+    np = numpy
+    n, lat, lon, alt = np.broadcast_arrays(
+        np.asarray(n, dtype=np.float64),
+        np.asarray(lat, dtype=np.float64),
+        np.asarray(lon, dtype=np.float64),
+        np.asarray(alt, dtype=np.float64))
+    assert(((FIRST_DAY <= n) & (n < LAST_DAY)).all())
+    J = n - lon/360
+    M = np.fmod(357.5291 + 0.98560028*J, 360)
+    sinM = np.sin(np.radians(M))
+    C = 1.9148*sinM + 0.0200*np.sin(np.radians(2*M))\
+      + 0.0003*np.sin(np.radians(3*M))
+    λ = np.fmod(M + C + 180 + 102.9372, 360)
+    Jt = 2451545.0 + J + 0.0053*sinM - 0.0069*np.sin(np.radians(2*λ))
+    sinδ = np.sin(np.radians(λ))*SINε
+    φ = np.radians(lat)
+    cosω0 = (np.sin(np.radians(-0.83 - 2.076*np.sqrt(alt)/60))
+             - np.sin(φ)*sinδ) / (np.cos(φ)*np.cos(np.arcsin(sinδ)))
+    ω0 = np.degrees(np.arccos(np.clip(cosω0, -1.0, 1.0)))
+    ω0 = np.where(cosω0 <= -1.0, 360.0, ω0)
+    ω0 = np.where(cosω0 >= 1.0, -360.0, ω0)
+    return Jt - ω0/360, Jt + ω0/360
+
+def equation_batch(n, lat, lon, alt=0):
+    # Arguments are sequences (or scalars) of equal length; returns
+    # NumPy arrays if available, `array('d')` otherwise.
+    if numpy is not None:
+        return equation_numpy(n, lat, lon, alt)
+    return equation_array(n, lat, lon, alt)
@@ -0,0 +1,88 @@
+# cache.py
+
+from . import equation
+
+class _OrderedDict:
+    # Just enough of `collections.OrderedDict` for `SunCache`, for builds
+    # without it: plain MicroPython dicts do not keep insertion order, so
+    # keys are also kept in a list, oldest first (a few dozen at most).
+    def __init__(self) -> None:
+        self._data: dict = {}
+        self._keys: list = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self._data:
+            self._keys.append(key)
+        self._data[key] = value
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+        self._keys.remove(key)
+
+    def pop(self, key):
+        value = self._data.pop(key)
+        self._keys.remove(key)
+        return value
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    OrderedDict = _OrderedDict
+
+class SunCache:
+    def __init__(
+        self,
+        capacity: int=32,
+    ) -> None:
+        self.capacity: int = capacity
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: dict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def equation(
+        self,
+        n: int,
+        lat: float,
+        lon: float,
+        alt: float,
+        solver=None,
+    ) -> tuple[float, float]:
+        # Same as `equation` (or *solver*, if any), least recently used
+        # results are dropped first.
+        key = (n, lat, lon, alt, solver)
+        data = self._data
+        try:
+            value = data.pop(key)
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            value = (equation if solver is None else solver)(n, lat, lon, alt)
+            if self.capacity <= 0:
+                return value
+            while len(data) >= self.capacity:
+                del data[next(iter(data))]
+        data[key] = value
+        return value
+
+    def resize(
+        self,
+        capacity: int,
+    ) -> None:
+        self.capacity = capacity
+        data = self._data
+        while len(data) > max(capacity, 0):
+            del data[next(iter(data))]
+
+    def clear(self) -> None:
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,40 @@
+# fast.py
+#
+# Same model as `suntime.equation` with fewer transcendental functions:
+# harmonics of the mean anomaly come from double and triple angle formulas,
+# `cos(δ)` from `sin(δ)`, and angles are converted by constant factors
+# rather than `radians()` and `degrees()` calls. Seven calls are left (sine
+# and cosine of M and λ, `acos` and two depending on the place only) instead
+# of twelve. Results differ from `equation` by a few ulps at most, so
+# minutes are the same but for rounding ties.
+
+from math import acos, cos, pi, sqrt, sin
+from . import FIRST_DAY, LAST_DAY, SINε
+
+RAD = pi/180
+TURNS = 1/(2*pi) # radians to fractions of a turn, i.e. of a day
+
+def equation (n: int, lat: float, lon: float, alt: float) -> tuple[float, float]:
+    # Same interface as `suntime.equation`.
+    assert(FIRST_DAY <= n < LAST_DAY)
+    Js = n - lon/360
+    M = (357.5291 + 0.98560028*Js) % 360
+    m = M*RAD
+    sinM = sin(m)
+    cosM = cos(m)
+    # 1.9148 sin(M) + 0.0200 sin(2M) + 0.0003 sin(3M)
+    C = sinM*(1.9148 + 0.0400*cosM + 0.0003*(3 - 4*sinM*sinM))
+    λ = (M + C + 282.9372)*RAD # 282.9372 = 180 + 102.9372, no need for mod
+    sinλ = sin(λ)
+    Jt = 2451545.0 + Js + 0.0053*sinM - 0.0138*sinλ*cos(λ)
+    sinδ = sinλ*SINε
+    sinφ = sin(lat*RAD)
+    cosω0 = (sin((-0.83 - 2.076*sqrt(alt)/60)*RAD) - sinφ*sinδ)\
+          / sqrt((1 - sinφ*sinφ)*(1 - sinδ*sinδ)) # cos(φ) cos(δ)
+    if cosω0 <= -1.0:
+        ω0 = 1.0 # 360°
+    elif cosω0 >= 1.0:
+        ω0 = -1.0
+    else:
+        ω0 = acos(cosω0)*TURNS
+    return Jt - ω0, Jt + ω0
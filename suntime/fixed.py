@@ -0,0 +1,212 @@
+# fixed.py
+#
+# Integer-only sunrise equation for boards without FPU. Angles are binary
+# angle units (65536 per turn), which are also the time unit (65536 per
+# day): an hour angle of ω0 units is ω0 units of time. Sines and cosines are
+# fixed point numbers with 14 fractional bits; all intermediate values fit
+# MicroPython's small integers, so no object is allocated on the heap.
+# Floats are only used for per-place constants.
+
+from math import cos, radians as rad, sin, sqrt
+from . import FIRST_DAY, LAST_DAY, NORMAL, POLAR_DAY, POLAR_NIGHT,\
+              suntime as _suntime
+from .suntime import day2000
+
+ONE = 1 << 14 # 1.0
+TURN = 1 << 16 # 360° or one day
+QUARTER = TURN >> 2
+
+def _bam(degrees: float) -> int:
+    return int(round(degrees*TURN/360))
+
+# Tables and constants are literals, so that importing this module takes no
+# floating point computation; they were generated by the expressions in
+# comments.
+
+# sine on a quarter of turn, 256 steps + 1:
+#   round(sin(i*pi/512)*ONE) for i in range(257)
+SINES = (
+    0, 101, 201, 302, 402, 503, 603, 704, 804, 904, 1005, 1105, 1205, 1306,
+    1406, 1506, 1606, 1706, 1806, 1906, 2006, 2105, 2205, 2305, 2404, 2503,
+    2603, 2702, 2801, 2900, 2999, 3098, 3196, 3295, 3393, 3492, 3590, 3688,
+    3786, 3883, 3981, 4078, 4176, 4273, 4370, 4467, 4563, 4660, 4756, 4852,
+    4948, 5044, 5139, 5235, 5330, 5425, 5520, 5614, 5708, 5803, 5897, 5990,
+    6084, 6177, 6270, 6363, 6455, 6547, 6639, 6731, 6823, 6914, 7005, 7096,
+    7186, 7276, 7366, 7456, 7545, 7635, 7723, 7812, 7900, 7988, 8076, 8163,
+    8250, 8337, 8423, 8509, 8595, 8680, 8765, 8850, 8935, 9019, 9102, 9186,
+    9269, 9352, 9434, 9516, 9598, 9679, 9760, 9841, 9921, 10001, 10080,
+    10159, 10238, 10316, 10394, 10471, 10549, 10625, 10702, 10778, 10853,
+    10928, 11003, 11077, 11151, 11224, 11297, 11370, 11442, 11514, 11585,
+    11656, 11727, 11797, 11866, 11935, 12004, 12072, 12140, 12207, 12274,
+    12340, 12406, 12472, 12537, 12601, 12665, 12729, 12792, 12854, 12916,
+    12978, 13039, 13100, 13160, 13219, 13279, 13337, 13395, 13453, 13510,
+    13567, 13623, 13678, 13733, 13788, 13842, 13896, 13949, 14001, 14053,
+    14104, 14155, 14206, 14256, 14305, 14354, 14402, 14449, 14497, 14543,
+    14589, 14635, 14680, 14724, 14768, 14811, 14854, 14896, 14937, 14978,
+    15019, 15059, 15098, 15137, 15175, 15213, 15250, 15286, 15322, 15357,
+    15392, 15426, 15460, 15493, 15525, 15557, 15588, 15619, 15649, 15679,
+    15707, 15736, 15763, 15791, 15817, 15843, 15868, 15893, 15917, 15941,
+    15964, 15986, 16008, 16029, 16049, 16069, 16088, 16107, 16125, 16143,
+    16160, 16176, 16192, 16207, 16221, 16235, 16248, 16261, 16273, 16284,
+    16295, 16305, 16315, 16324, 16332, 16340, 16347, 16353, 16359, 16364,
+    16369, 16373, 16376, 16379, 16381, 16383, 16384, 16384,
+)
+# arctangents of 2^-i for CORDIC, in 1/16 of unit:
+#   round(atan(2**-i)*TURN*16/(2*pi)) for i in range(16)
+ATANS = (131072, 77376, 40884, 20753, 10417, 5213, 2607, 1304, 652, 326, 163,
+         81, 41, 20, 10, 5)
+
+SINε = 6517 # round(sin(rad(23.44))*ONE)
+M0 = 65086 # _bam(357.5291)
+L0 = 51507 # _bam(180 + 102.9372)
+# mean anomaly advances by 179 + 6931/16384 units per day:
+#   round((0.98560028*TURN/360 - ΔM_INT)*ONE)
+ΔM_INT = 179
+ΔM_FRAC = 6931
+# C = (C1*sin(M) + C2*sin(2M) + C3*sin(3M)) >> 21, in units:
+#   _bam(1.9148*128), _bam(0.0200*128), _bam(0.0003*128)
+C1 = 44618
+C2 = 466
+C3 = 7
+# equation of time = (E1*sin(M) - E2*sin(2λ)) >> 17, in units:
+#   round(0.0053*TURN*8), round(0.0069*TURN*8)
+E1 = 2779
+E2 = 3618
+
+def isin(a: int) -> int:
+    a &= TURN - 1
+    x = a & (QUARTER - 1)
+    if a & QUARTER:
+        x = QUARTER - x
+    i = x >> 6
+    v = SINES[i]
+    if i < 256:
+        v += ((SINES[i + 1] - v)*(x & 63)) >> 6
+    return -v if a & (TURN >> 1) else v
+
+def isqrt(x: int) -> int:
+    # Square root of *x* in [0; 2^28].
+    if x <= 0:
+        return 0
+    r = ONE
+    while True:
+        y = (r + x//r) >> 1
+        if y >= r:
+            return r
+        r = y
+
+def iatan2(y: int, x: int) -> int:
+    # Angle of vector (x, y) for *y* ≥ 0, in [0; TURN/2].
+    if x == 0 and y == 0:
+        return 0
+    while abs(x) + y < ONE: # more bits for precision
+        x <<= 1
+        y <<= 1
+    x <<= 4
+    y <<= 4
+    a = 0
+    if x < 0:
+        x, y = y, -x
+        a = QUARTER << 4
+    for i in range(16):
+        if y > 0:
+            x, y = x + (y >> i), y - (x >> i)
+            a += ATANS[i]
+        else:
+            x, y = x - (y >> i), y + (x >> i)
+            a -= ATANS[i]
+    return (a + 8) >> 4
+
+class FixedSite:
+    # Same as `suntime.Site` with integers; `solve(n, tz)` stores sunrise and
+    # sunset in minutes since 00:00 in `sunrise` and `sunset`, and the state
+    # of the day (see `suntime.day_state`) in `state`.
+    __slots__ = ('lon', 'lonM', 'sinφ', 'cosφ', 'sinh0', 'sunrise', 'sunset',
+                 'state')
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        alt: float=0,
+    ) -> None:
+        self.lon: int = _bam(lon)
+        self.lonM: int = _bam(0.98560028*lon/360)
+        self.sinφ: int = int(round(sin(rad(lat))*ONE))
+        self.cosφ: int = int(round(cos(rad(lat))*ONE))
+        self.sinh0: int = int(round(sin(rad(-0.83 - 2.076*sqrt(alt)/60))*ONE))
+        self.sunrise: int = 0
+        self.sunset: int = 0
+        self.state: int = NORMAL
+
+    def solve(
+        self,
+        n: int,
+        tz: int=0,
+    ) -> None:
+        assert(FIRST_DAY <= n < LAST_DAY)
+        M = (M0 + n*ΔM_INT + ((n*ΔM_FRAC) >> 14) - self.lonM) & (TURN - 1)
+        sinM = isin(M)
+        C = (C1*sinM + C2*isin(2*M) + C3*isin(3*M)) >> 21
+        λ = M + C + L0
+        t = -self.lon + ((E1*sinM - E2*isin(2*λ)) >> 17) # transit - noon
+        sinδ = (isin(λ)*SINε) >> 14
+        cosδ = isqrt(ONE*ONE - sinδ*sinδ)
+        num = self.sinh0 - ((self.sinφ*sinδ) >> 14)
+        den = (self.cosφ*cosδ) >> 14
+        if num <= -den:
+            ω0 = TURN
+            self.state = POLAR_DAY
+        elif num >= den:
+            ω0 = -TURN
+            self.state = POLAR_NIGHT
+        else:
+            ω0 = iatan2(isqrt(den*den - num*num), num)
+            self.state = NORMAL
+        self.sunrise = (((t - ω0)*1440 + (TURN >> 1)) >> 16) + 720 + tz
+        self.sunset  = (((t + ω0)*1440 + (TURN >> 1)) >> 16) + 720 + tz
+
+class Suntime(_suntime.Suntime):
+    # Same as `suntime.suntime.Suntime`; `calc_sunrise_sunset()` and
+    # `advance()` use integers only, other methods use floats.
+    __slots__ = ('fixed',)
+
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        altitude: int=0,
+        timezone: int=0,
+        cache: 'SunCache|None'=None,
+    ) -> None:
+        super().__init__(latitude, longitude, altitude, timezone, cache)
+        self.fixed: FixedSite = FixedSite(latitude, longitude, altitude)
+
+    def calc_sunrise_sunset(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        dst: int=0,
+    ) -> None:
+        n = day2000(year, month, day)
+        self.n = n
+        fixed = self.fixed
+        fixed.solve(n, self.timezone + dst)
+        self.sunrise = fixed.sunrise
+        self.sunset  = fixed.sunset
+        self.state = fixed.state
+
+    def advance(
+        self,
+        days: int=1,
+        dst: int=0,
+    ) -> None:
+        assert self.n is not None
+        n = self.n + days
+        self.n = n
+        fixed = self.fixed
+        fixed.solve(n, self.timezone + dst)
+        self.sunrise = fixed.sunrise
+        self.sunset  = fixed.sunset
+        self.state = fixed.state
@@ -0,0 +1,252 @@
+# grid.py
+#
+# Precompute sunrise and sunset over a grid of places for one year:
+#   python -m suntime.grid --lat -60 60 --lon -180 179 --step 1 --year 2025 \
+#                          --out grid/ --jobs 8 --merge grid.sun
+#
+# Each shard covers a band of latitudes and is written to its own file: a
+# header (see `HEADER`) followed, for each place (latitude-major), by
+# `days` minutes of sunrise and then `days` minutes of sunset since 00:00
+# UTC, as little-endian 16-bit integers. A merged file has the same format,
+# which `SunTableIndex` maps in memory for lookups. This module targets
+# CPython.
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from math import floor
+from . import Site, day_state, equation, jdate2time
+from .batch import equation_numpy, numpy
+from .suntime import day2000
+
+MAGIC = b'SUNG'
+HEADER = '<4sHHdddII' # magic, year, days, lat0, lon0, step, nlat, nlon
+HEADER_SIZE = struct.calcsize(HEADER)
+
+def year_days(year: int) -> tuple[int, int]:
+    # Last day rather than the next year, out of range after 2399.
+    first = day2000(year, 1, 1)
+    return first, day2000(year, 12, 31) + 1 - first
+
+def pack_header(
+    year: int,
+    lat0: float,
+    lon0: float,
+    step: float,
+    nlat: int,
+    nlon: int,
+) -> bytes:
+    return struct.pack(HEADER, MAGIC, year, year_days(year)[1],
+                       lat0, lon0, step, nlat, nlon)
+
+def unpack_header(data) -> tuple:
+    # Return `(year, days, lat0, lon0, step, nlat, nlon)`.
+    fields = struct.unpack_from(HEADER, data)
+    if fields[0] != MAGIC:
+        raise ValueError("not a sun grid")
+    return fields[1:]
+
+def compute_rows(
+    year: int,
+    lat0: float,
+    lon0: float,
+    step: float,
+    nlat: int,
+    nlon: int,
+) -> bytes:
+    first, days = year_days(year)
+    if numpy is not None:
+        np = numpy
+        n = np.arange(first, first + days)
+        lon = lon0 + step*np.arange(nlon)
+        out = np.empty((nlat, nlon, 2, days), dtype='<i2')
+        for i in range(nlat):
+            Jr, Js = equation_numpy(n[None, :], lat0 + step*i, lon[:, None])
+            base = 2451545 + n
+            out[i, :, 0] = np.rint((Jr - base)*1440) + 720
+            out[i, :, 1] = np.rint((Js - base)*1440) + 720
+        return out.tobytes()
+    out = array('h')
+    for i in range(nlat):
+        for j in range(nlon):
+            site = Site(lat0 + step*i, lon0 + step*j)
+            sunset = array('h')
+            for n in range(first, first + days):
+                site.solve(n)
+                out.append(jdate2time(site.Jr, n))
+                sunset.append(jdate2time(site.Js, n))
+            out.extend(sunset)
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out.tobytes()
+
+def write_shard(task: tuple) -> str:
+    path, year, lat0, lon0, step, nlat, nlon = task
+    with open(path, 'wb') as f:
+        f.write(pack_header(year, lat0, lon0, step, nlat, nlon))
+        f.write(compute_rows(year, lat0, lon0, step, nlat, nlon))
+    return path
+
+def shard_tasks(
+    out: str,
+    year: int,
+    lat: tuple[float, float],
+    lon: tuple[float, float],
+    step: float,
+    shards: int,
+) -> list[tuple]:
+    nlat = int(round((lat[1] - lat[0])/step)) + 1
+    nlon = int(round((lon[1] - lon[0])/step)) + 1
+    shards = max(1, min(shards, nlat))
+    tasks = []
+    for k in range(shards):
+        i0 = k*nlat//shards
+        i1 = (k + 1)*nlat//shards
+        path = os.path.join(out, "shard-%04d.sun" % k)
+        tasks.append((path, year, lat[0] + step*i0, lon[0], step, i1 - i0, nlon))
+    return tasks
+
+def merge(
+    paths: list[str],
+    out: str,
+) -> None:
+    # Shards must share year, longitudes and step and be contiguous in
+    # latitude; they are sorted by their first latitude.
+    headers = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            headers.append((unpack_header(f.read(HEADER_SIZE)), path))
+    headers.sort(key=lambda h: h[0][2])
+    year, days, lat0, lon0, step, nlat, nlon = headers[0][0]
+    total = 0
+    for h, path in headers:
+        if (h[0], h[1], h[3], h[4], h[6]) != (year, days, lon0, step, nlon):
+            raise ValueError("incompatible shard: " + path)
+        if abs(h[2] - (lat0 + step*total)) > step*1e-6:
+            raise ValueError("non-contiguous shard: " + path)
+        total += h[5]
+    with open(out, 'wb') as f:
+        f.write(pack_header(year, lat0, lon0, step, total, nlon))
+        for _, path in headers:
+            with open(path, 'rb') as g:
+                g.seek(HEADER_SIZE)
+                while True:
+                    chunk = g.read(1 << 20)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+
+def _state(sunrise: int, sunset: int) -> int:
+    # Same as `day_state`, from minutes: only their difference matters.
+    return day_state(sunrise/1440, sunset/1440)
+
+class SunTableIndex:
+    # Read-only lookups into a grid file, mapped in memory: pages are shared
+    # among processes through the OS cache and nothing is loaded upfront.
+    def __init__(
+        self,
+        path: str,
+        interpolation: str='nearest',
+    ) -> None:
+        if interpolation not in ('nearest', 'bilinear'):
+            raise ValueError(interpolation)
+        self.interpolation: str = interpolation
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.year, self.days, self.lat0, self.lon0, self.step,\
+            self.nlat, self.nlon = unpack_header(self._map)
+        self.first: int = day2000(self.year, 1, 1)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'SunTableIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def point(
+        self,
+        i: int,
+        j: int,
+        d: int,
+    ) -> tuple[int, int]:
+        # Sunrise and sunset at grid row *i*, column *j*, day of year *d*.
+        offset = HEADER_SIZE + (i*self.nlon + j)*4*self.days + 2*d
+        sunrise, = struct.unpack_from('<h', self._map, offset)
+        sunset,  = struct.unpack_from('<h', self._map, offset + 2*self.days)
+        return sunrise, sunset
+
+    def lookup(
+        self,
+        latitude: float,
+        longitude: float,
+        year: int,
+        month: int,
+        day: int,
+    ) -> tuple[int, int]:
+        # Return sunrise and sunset in minutes since 00:00 UTC. Places out of
+        # the grid and dates out of its year are computed by `equation`.
+        n = day2000(year, month, day)
+        d = n - self.first
+        x = (latitude - self.lat0)/self.step
+        y = (longitude - self.lon0)/self.step
+        if not (0 <= d < self.days
+                and 0 <= x <= self.nlat - 1 and 0 <= y <= self.nlon - 1):
+            Jr, Js = equation(n, latitude, longitude, 0)
+            return jdate2time(Jr, n), jdate2time(Js, n)
+        nearest = self.point(int(round(x)), int(round(y)), d)
+        if self.interpolation == 'nearest':
+            return nearest
+        i = min(int(floor(x)), max(self.nlat - 2, 0))
+        j = min(int(floor(y)), max(self.nlon - 2, 0))
+        fx = x - i
+        fy = y - j
+        sunrise = sunset = 0.0
+        state = _state(*nearest)
+        for di, dj, w in ((0, 0, (1 - fx)*(1 - fy)), (0, 1, (1 - fx)*fy),
+                          (1, 0, fx*(1 - fy)),       (1, 1, fx*fy)):
+            if w == 0:
+                continue
+            r, s = self.point(i + di, j + dj, d)
+            if _state(r, s) != state:
+                return nearest # no meaningful interpolation
+            sunrise += w*r
+            sunset += w*s
+        return int(round(sunrise)), int(round(sunset))
+
+def main(argv: list[str]|None=None) -> None:
+    import argparse
+    import multiprocessing
+    p = argparse.ArgumentParser(prog="python -m suntime.grid",
+        description="Precompute sunrise/sunset over a latitude/longitude grid.")
+    p.add_argument("--lat", type=float, nargs=2, default=(-90.0, 90.0),
+                   metavar=("MIN", "MAX"), help="latitude range (included)")
+    p.add_argument("--lon", type=float, nargs=2, default=(-180.0, 179.0),
+                   metavar=("MIN", "MAX"), help="longitude range (included)")
+    p.add_argument("--step", type=float, default=1.0, help="grid step in degrees")
+    p.add_argument("--year", type=int, required=True, help="year in [1600; 2400)")
+    p.add_argument("--out", default=".", help="directory for shard files")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                   help="number of worker processes")
+    p.add_argument("--shards", type=int, default=0,
+                   help="number of shards (default: 4 per job)")
+    p.add_argument("--merge", metavar="FILE", help="merge shards into FILE")
+    args = p.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    tasks = shard_tasks(args.out, args.year, args.lat, args.lon, args.step,
+                        args.shards or 4*args.jobs)
+    if args.jobs > 1:
+        with multiprocessing.Pool(args.jobs) as pool:
+            paths = pool.map(write_shard, tasks, chunksize=1)
+    else:
+        paths = [write_shard(task) for task in tasks]
+    if args.merge:
+        merge(paths, args.merge)
+
+if __name__ == '__main__':
+    main()
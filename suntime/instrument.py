@@ -0,0 +1,166 @@
+# instrument.py
+#
+# Optional instrumentation of the hot paths: `enable()` replaces functions
+# and methods with wrappers counting calls, elapsed time and polar days or
+# nights (clamped `cosω0`); `disable()` puts the originals back. Nothing is
+# wrapped unless enabled, so there is no cost otherwise. Enable it after
+# importing the modules to be instrumented: only loaded modules are patched.
+#
+#   from suntime import instrument
+#   instrument.enable()
+#   ...
+#   suntime.stats()
+
+import sys
+from . import NORMAL, day_state
+
+# Nanosecond clock, also used by the scripts in `tests`.
+try:
+    from time import ticks_diff, ticks_us
+    def ticks_ns() -> int:
+        return ticks_us()*1000
+    def ticks_ns_diff(a: int, b: int) -> int:
+        return ticks_diff(a//1000, b//1000)*1000
+except ImportError: # CPython
+    from time import perf_counter_ns as ticks_ns
+    def ticks_ns_diff(a: int, b: int) -> int:
+        return a - b
+
+# (module, function)
+FUNCTIONS = (
+    ('suntime', 'equation'),
+    ('suntime', 'jdate2time'),
+    ('suntime.sundatetime', 'jdate2datetime'),
+    # conversions actually run by `Sundatetime` and `iter_sun_events`
+    ('suntime.sundatetime', '_jdate2datetime'),
+    ('suntime.sundatetime', '_minutes2datetime'),
+)
+# (module, class, method)
+METHODS = (
+    ('suntime', 'Site', 'solve'),
+    ('suntime', 'Site', 'step'),
+    ('suntime.suntime', 'Suntime', 'calc_sunrise_sunset'),
+    ('suntime.fixed', 'Suntime', 'calc_sunrise_sunset'),
+    ('suntime.sundatetime', 'Sundatetime', 'calc_sunrise_sunset'),
+)
+
+_calls: dict = {} # name: number of calls
+_ns: dict = {} # name: total elapsed time
+_counters: dict = {'polar': 0, 'redundant': 0}
+_patched: list = [] # (object, attribute, original)
+_wrappers: dict = {} # id(wrapper): (wrapper, original function)
+
+def _polar(Jr: float, Js: float) -> None:
+    if day_state(Jr, Js) != NORMAL:
+        _counters['polar'] += 1
+
+def _count(name: str, t0: int) -> None:
+    _ns[name] = _ns.get(name, 0) + ticks_ns_diff(ticks_ns(), t0)
+    _calls[name] = _calls.get(name, 0) + 1
+
+def _wrap_function(name: str, func):
+    if name == 'equation':
+        def wrapper(*args):
+            t0 = ticks_ns()
+            result = func(*args)
+            _count(name, t0)
+            _polar(*result)
+            return result
+    else:
+        def wrapper(*args):
+            t0 = ticks_ns()
+            result = func(*args)
+            _count(name, t0)
+            return result
+    return wrapper
+
+def _state(obj) -> tuple:
+    # Results of `calc_sunrise_sunset()`, for spotting redundant calls.
+    if hasattr(obj, 'sunrise_utc'):
+        return obj.sunrise_utc, obj.sunset_utc, obj.tzinfo
+    return obj.n, obj.sunrise, obj.sunset
+
+def _wrap_method(name: str, method):
+    if name.startswith('Site.'):
+        def wrapper(self, *args):
+            t0 = ticks_ns()
+            method(self, *args)
+            _count(name, t0)
+            _polar(self.Jr, self.Js)
+    else:
+        def wrapper(self, *args, **kwargs):
+            before = _state(self)
+            t0 = ticks_ns()
+            method(self, *args, **kwargs)
+            _count(name, t0)
+            if _state(self) == before:
+                _counters['redundant'] += 1
+    return wrapper
+
+def _patch(obj, attr: str, value) -> None:
+    _patched.append((obj, attr, getattr(obj, attr)))
+    setattr(obj, attr, value)
+
+def _modules() -> list:
+    return [m for k, m in sys.modules.items()
+            if m is not None and (k == 'suntime' or k.startswith('suntime.'))]
+
+def enable() -> None:
+    if _patched:
+        return
+    modules = _modules()
+    for module, name in FUNCTIONS:
+        module = sys.modules.get(module)
+        if module is None:
+            continue
+        func = getattr(module, name)
+        wrapper = _wrap_function(name, func)
+        _wrappers[id(wrapper)] = wrapper, func
+        # also replace names bound by `from . import ...`
+        for m in modules:
+            if m.__dict__.get(name) is func:
+                _patch(m, name, wrapper)
+    for module, cls, name in METHODS:
+        module = sys.modules.get(module)
+        if module is None:
+            continue
+        label = cls + '.' + name
+        if module.__name__ == 'suntime.fixed':
+            label = 'fixed.' + label
+        cls = getattr(module, cls)
+        _patch(cls, name, _wrap_method(label, getattr(cls, name)))
+
+def disable() -> None:
+    while _patched:
+        obj, attr, value = _patched.pop()
+        setattr(obj, attr, value)
+    # modules imported while enabled bound the wrappers by `from . import`
+    if _wrappers:
+        for m in _modules():
+            for name, value in list(m.__dict__.items()):
+                wrapper = _wrappers.get(id(value))
+                if wrapper is not None and wrapper[0] is value:
+                    setattr(m, name, wrapper[1])
+        _wrappers.clear()
+
+def enabled() -> bool:
+    return bool(_patched)
+
+def reset() -> None:
+    _calls.clear()
+    _ns.clear()
+    for k in _counters:
+        _counters[k] = 0
+
+def stats() -> dict:
+    # Snapshot of the counters: `calls` and elapsed `ns` (including nested
+    # calls) per function, `polar` days/nights met by `equation` and
+    # `Site` and `redundant` calls to `calc_sunrise_sunset()` leaving the
+    # results unchanged.
+    return {
+        'enabled': enabled(),
+        'calls': dict(_calls),
+        'ns': dict(_ns),
+        'polar': _counters['polar'],
+        'redundant': _counters['redundant'],
+    }
@@ -0,0 +1,110 @@
+# position.py
+#
+# Position of Sun in the sky (elevation and azimuth) at any instant, after
+# the same low-order model as `equation`. Declination and solar transit are
+# computed once a day; each query only updates the hour angle.
+
+from array import array
+from math import asin, atan2, degrees as deg, sqrt, radians as rad, sin, cos
+from . import transit
+
+class SolarPosition:
+    # Elevation and azimuth of Sun at a place, at times *t* in seconds since
+    # 2000-01-01 00:00 UTC (see `scheduler.clock()`).
+    # Between two consecutive transits, the hour angle and `sin(δ)` are
+    # interpolated linearly, so that the equation of time and declination
+    # keep changing during the day.
+    __slots__ = ('lon', 'sinφ', 'cosφ', 'n', '_Jt', '_sinδ', '_Jt1', '_sinδ1',
+                 '_k', '_dsinδ')
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+    ) -> None:
+        self.lon: float = lon
+        self.sinφ: float = sin(rad(lat))
+        self.cosφ: float = cos(rad(lat))
+        self.n: int|None = None # day of the cached terms
+        self._Jt: float = 0.0
+        self._sinδ: float = 0.0
+        self._Jt1: float = 0.0 # transit of the next day
+        self._sinδ1: float = 0.0
+        self._k: float = 0.0 # degrees of hour angle per day
+        self._dsinδ: float = 0.0 # change of `sin(δ)` per day
+
+    def day(
+        self,
+        n: int,
+    ) -> None:
+        # Cache the terms from the transit of day *n* to the next one. When
+        # stepping one day at a time, only the next transit is computed.
+        if n == self.n:
+            return
+        if self.n is not None and n == self.n + 1:
+            Jt, sinδ = self._Jt1, self._sinδ1
+        else:
+            Jt, sinδ = transit(n, self.lon)
+        Jt1, sinδ1 = transit(n + 1, self.lon)
+        self.n = n
+        self._Jt = Jt
+        self._sinδ = sinδ
+        self._Jt1 = Jt1
+        self._sinδ1 = sinδ1
+        self._k = 360/(Jt1 - Jt)
+        self._dsinδ = (sinδ1 - sinδ)/(Jt1 - Jt)
+
+    def at(
+        self,
+        t: float,
+    ) -> tuple[float, float]:
+        # Return `(elevation, azimuth)` in degrees at time *t*: elevation is
+        # geometric (no refraction), azimuth is clockwise from North.
+        Jd = 2451544.5 + t/86400
+        self.day(int((Jd - 2451545.0 + self.lon/360)//1)) # last mean transit
+        u = Jd - self._Jt
+        ω = rad(u*self._k)
+        sinδ = self._sinδ + u*self._dsinδ
+        cosδ = sqrt(1 - sinδ*sinδ)
+        cosω = cos(ω)
+        sinh = self.sinφ*sinδ + self.cosφ*cosδ*cosω
+        A = deg(atan2(-cosδ*sin(ω), self.cosφ*sinδ - self.sinφ*cosδ*cosω))
+        return deg(asin(sinh)), A % 360
+
+    def at_array(
+        self,
+        times,
+        elevation: array|None=None,
+        azimuth: array|None=None,
+    ) -> tuple[array, array]:
+        # Same as `at` for each time in *times*, stored into *elevation* and
+        # *azimuth* (new `array('d')` if `None`, otherwise filled in place,
+        # e.g. to reuse buffers at every sample).
+        size = len(times)
+        if elevation is None:
+            elevation = array('d', bytes(8*size))
+        if azimuth is None:
+            azimuth = array('d', bytes(8*size))
+        assert(len(elevation) >= size and len(azimuth) >= size)
+        sinφ = self.sinφ
+        cosφ = self.cosφ
+        J0 = 2451545.0 - self.lon/360
+        n = None
+        for i in range(size):
+            Jd = 2451544.5 + times[i]/86400
+            m = int((Jd - J0)//1)
+            if m != n:
+                self.day(m)
+                n = m
+                Jt = self._Jt
+                k = self._k
+                sinδ0 = self._sinδ
+                dsinδ = self._dsinδ
+            u = Jd - Jt
+            ω = rad(u*k)
+            sinδ = sinδ0 + u*dsinδ
+            cosδ = sqrt(1 - sinδ*sinδ)
+            cosω = cos(ω)
+            elevation[i] = deg(asin(sinφ*sinδ + cosφ*cosδ*cosω))
+            azimuth[i] = deg(atan2(-cosδ*sin(ω), cosφ*sinδ - sinφ*cosδ*cosω)) % 360
+        return elevation, azimuth
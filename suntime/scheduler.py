@@ -0,0 +1,131 @@
+# scheduler.py
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+import time
+from heapq import heappop, heappush
+from . import FIRST_DAY, jdate2time, seek
+
+SUNRISE = 'sunrise'
+SUNSET = 'sunset'
+
+# seconds from the time epoch to 2000-01-01 00:00 UTC (the epoch of most
+# MicroPython ports already)
+EPOCH = 946684800 if time.gmtime(0)[0] == 1970 else 0
+
+def clock() -> float:
+    # Seconds since 2000-01-01 00:00 UTC.
+    return time.time() - EPOCH
+
+class Scheduler:
+    # Call back at sunrise/sunset of many places from one event loop. Places
+    # are any object with a `solve(n)` method, i.e. `Suntime` and
+    # `Sundatetime`; each of them is computed once per day.
+    def __init__(
+        self,
+        clock=clock,
+    ) -> None:
+        self.clock = clock
+        self._queue: list = [] # (time, seq, entry)
+        self._seq: int = 0
+        self._days: dict = {} # site: {n: (Jr, Js)} for the latest days
+        self._wake = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(
+        self,
+        site,
+        event: str,
+        callback,
+        offset: int=0,
+    ) -> list:
+        # Call `callback(site, event)` at every *event* (`SUNRISE` or
+        # `SUNSET`) plus *offset* minutes (negative for "before"). A handle
+        # for `cancel()` is returned.
+        if event not in (SUNRISE, SUNSET):
+            raise ValueError(event)
+        entry = [site, event, callback, offset*60, True]
+        self._push(entry, self.clock())
+        self._wake.set()
+        return entry
+
+    def cancel(
+        self,
+        entry: list,
+    ) -> None:
+        entry[4] = False
+
+    def _solve(
+        self,
+        site,
+        n: int,
+    ) -> tuple[float, float]:
+        days = self._days.get(site)
+        if days is None:
+            days = self._days[site] = {}
+        day = days.get(n)
+        if day is None:
+            day = days[n] = site.solve(n)
+            for k in [k for k in days if k < n - 2]:
+                del days[k]
+        return day
+
+    def _push(
+        self,
+        entry: list,
+        after: float,
+    ) -> None:
+        # Queue the first occurrence of *entry* strictly after *after*.
+        site, event, _, offset, _ = entry
+        solve = lambda n: self._solve(site, n)
+        n = int((after - offset)//86400) - 1
+        while True:
+            n = seek(solve, max(n, FIRST_DAY), 1)
+            if n is None:
+                return # no more events, see `FIRST_DAY` and `LAST_DAY`
+            Jr, Js = solve(n)
+            Jd = Jr if event == SUNRISE else Js
+            t = (n*1440 + jdate2time(Jd, n))*60 + offset
+            if t > after:
+                break
+            n += 1
+        self._seq += 1
+        heappush(self._queue, (t, self._seq, entry))
+
+    def run_pending(
+        self,
+        now: float|None=None,
+    ) -> float|None:
+        # Fire all events due by *now* and return the seconds until the next
+        # one, `None` if there is none.
+        if now is None:
+            now = self.clock()
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            t, _, entry = heappop(queue)
+            if not entry[4]:
+                continue
+            self._push(entry, t)
+            result = entry[2](entry[0], entry[1])
+            if result is not None and hasattr(result, 'send'): # coroutine
+                asyncio.create_task(result)
+        while queue and not queue[0][2][4]:
+            heappop(queue)
+        return queue[0][0] - now if queue else None
+
+    async def run(self) -> None:
+        # Sleep until the next event (or a new `add()`) and fire it, forever.
+        while True:
+            self._wake.clear()
+            delay = self.run_pending()
+            try:
+                if delay is None:
+                    await self._wake.wait()
+                else:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,155 @@
+# service.py
+#
+# Thread-safe sunrise/sunset queries for threaded servers: results are
+# immutable, computations are cached and concurrent identical queries are
+# computed once. This module targets CPython.
+#
+#   service = SunService()
+#   times = service.query(42.5966460, 12.4360233, (2025, 6, 21), timezone=60)
+#   times.sunrise, times.sunset
+
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from . import equation, jdate2time
+from .suntime import day2000
+
+class SunTimes(namedtuple('SunTimes', ('date', 'sunrise', 'sunset'))):
+    # Sunrise and sunset of *date* `(year, month, day)` in minutes since
+    # 00:00 local time, same as `Suntime`.
+    __slots__ = ()
+
+    def is_daytime(
+        self,
+        minutes: int,
+    ) -> bool|None:
+        if not 0 <= minutes < 1440:
+            return None
+        return self.sunrise <= minutes < self.sunset
+
+    def is_nighttime(
+        self,
+        minutes: int,
+    ) -> bool|None:
+        daytime = self.is_daytime(minutes)
+        if daytime is None:
+            return None
+        return not daytime
+
+class SunService:
+    # Stateless facade over `equation` (or *solver*), safe to share among
+    # threads. The last *capacity* results are kept; a query already being
+    # computed by another thread waits for its result instead of computing it
+    # again. Time zone and DST only affect the conversion of the result, so
+    # they do not split the cache.
+    def __init__(
+        self,
+        capacity: int=1024,
+        solver=None,
+        max_workers: int|None=None,
+    ) -> None:
+        self.capacity: int = capacity
+        self.solver = equation if solver is None else solver
+        self.max_workers: int|None = max_workers
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0 # queries which waited for another thread
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._pending: dict = {} # key: Future
+        self._executor: ThreadPoolExecutor|None = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def equation(
+        self,
+        n: int,
+        lat: float,
+        lon: float,
+        alt: float=0,
+    ) -> tuple[float, float]:
+        # Same as `equation`, cached and coalesced.
+        key = (n, lat, lon, alt)
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+                self.misses += 1
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+        if not owner:
+            return future.result()
+        try:
+            value = self.solver(n, lat, lon, alt)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            if self.capacity > 0:
+                data = self._data
+                data[key] = value
+                while len(data) > self.capacity:
+                    data.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def query(
+        self,
+        latitude: float,
+        longitude: float,
+        date: tuple[int, int, int],
+        altitude: int=0,
+        timezone: int=0,
+        dst: int=0,
+    ) -> SunTimes:
+        # Same results as `Suntime(latitude, longitude, altitude,
+        # timezone).calc_sunrise_sunset(*date, dst)`, as a new `SunTimes`.
+        n = day2000(*date)
+        Jr, Js = self.equation(n, latitude, longitude, altitude)
+        tz = timezone + dst
+        return SunTimes(tuple(date), jdate2time(Jr, n, tz), jdate2time(Js, n, tz))
+
+    def query_many(
+        self,
+        queries,
+    ) -> list[SunTimes]:
+        # Run `query(*args)` for each tuple in *queries* on a thread pool of
+        # *max_workers* threads, created on first use. Results are in the
+        # same order as *queries*.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+            executor = self._executor
+        return list(executor.map(lambda args: self.query(*args), queries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+
+    def close(self) -> None:
+        # Shut down the thread pool, if any; the service is still usable.
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> 'SunService':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
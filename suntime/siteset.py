@@ -0,0 +1,96 @@
+# siteset.py
+
+from array import array
+from . import equation, jdate2time
+from .suntime import day2000
+
+class SiteSet:
+    # Many places in parallel `array` columns: latitude and longitude as
+    # doubles, altitude, timezone, sunrise and sunset as 16-bit integers,
+    # i.e. 24 bytes per place instead of a `Suntime` instance each.
+    def __init__(self) -> None:
+        self.latitude: array = array('d')
+        self.longitude: array = array('d')
+        self.altitude: array = array('h')
+        self.timezone: array = array('h')
+        # minutes since 00:00 local time, as in `Suntime`
+        self.sunrise: array = array('h')
+        self.sunset: array = array('h')
+        self.n: int|None = None
+        self.dst: int = 0
+
+    def __len__(self) -> int:
+        return len(self.latitude)
+
+    def add(
+        self,
+        latitude: float,
+        longitude: float,
+        altitude: int=0,
+        timezone: int=0,
+    ) -> int:
+        # Append a place and return its id, i.e. its index in the columns.
+        # Its sunrise and sunset are 0 until the next computation.
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+        self.altitude.append(altitude)
+        self.timezone.append(timezone)
+        self.sunrise.append(0)
+        self.sunset.append(0)
+        return len(self.latitude) - 1
+
+    def calc_sunrise_sunset(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        dst: int=0,
+    ) -> None:
+        # Same as `Suntime.calc_sunrise_sunset()` for every place.
+        n = day2000(year, month, day)
+        latitude = self.latitude
+        longitude = self.longitude
+        altitude = self.altitude
+        timezone = self.timezone
+        sunrise = self.sunrise
+        sunset = self.sunset
+        for i in range(len(latitude)):
+            Jr, Js = equation(n, latitude[i], longitude[i], altitude[i])
+            tz = timezone[i] + dst
+            sunrise[i] = jdate2time(Jr, n, tz)
+            sunset[i]  = jdate2time(Js, n, tz)
+        self.n = n
+        self.dst = dst
+
+    def is_daytime(
+        self,
+        site_ids,
+        minutes: int,
+    ) -> bytearray|None:
+        # For each id in *site_ids* (all places if `None`), 1 if Sun is up
+        # *minutes* after 00:00 local time of the computed day, 0 otherwise.
+        # Same as `Suntime.is_daytime()`, `None` if *minutes* falls out of
+        # the day: sunrise and sunset of another day are not known.
+        assert self.n is not None
+        if not 0 <= minutes < 1440:
+            return None
+        if site_ids is None:
+            site_ids = range(len(self.latitude))
+        sunrise = self.sunrise
+        sunset = self.sunset
+        result = bytearray(len(site_ids))
+        for k, i in enumerate(site_ids):
+            result[k] = sunrise[i] <= minutes < sunset[i]
+        return result
+
+    def is_nighttime(
+        self,
+        site_ids,
+        minutes: int,
+    ) -> bytearray|None:
+        result = self.is_daytime(site_ids, minutes)
+        if result is None:
+            return None
+        for k in range(len(result)):
+            result[k] ^= 1
+        return result
@@ -1,56 +1,310 @@
 # sundatetime.py
 
 import datetime
-from . import equation, jdate2time
+from array import array
+from . import ASTRONOMICAL, CIVIL, HORIZON, NAUTICAL, NORMAL, Site,\
+              day_state, equation, equation_angles, find_event, jdate2time,\
+              polar_span
 
-def jdate2datetime(
-    Jd: float,
-    date: datetime.datetime,
+EPOCH = datetime.datetime(2000, 1, 1).toordinal()
+ONE_DAY = datetime.timedelta(days=1)
+
+def _minutes2datetime(
+    minutes: int,
+    tzinfo: datetime.tzinfo|None,
+    table: 'OffsetTable|None'=None,
 ) -> datetime.datetime:
-    days = date.toordinal()
-    n = days - datetime.datetime(2000, 1, 1).toordinal()
-    minutes = jdate2time(Jd, n)
-    days_, minutes = divmod(minutes, 1440)
-    days += days_
+    # *minutes* since 2000-01-01 00:00 UTC; *table*, if any, must be built
+    # from *tzinfo*.
+    if table is not None and table.start <= minutes < table.end:
+        return table.datetime(minutes)
+    days, minutes = divmod(minutes, 1440)
     dt = datetime.datetime(
-        0, 0, days,
+        0, 0, EPOCH + days,
         microsecond=minutes*60_000_000,
         tzinfo=datetime.timezone.utc)
-    if date.tzinfo:
-        dt = dt.astimezone(date.tzinfo)
+    if tzinfo:
+        dt = dt.astimezone(tzinfo)
     return dt
 
+def _datetime2minutes(
+    dt: datetime.datetime,
+) -> int:
+    # Minutes since 2000-01-01 00:00 UTC, seconds are truncated. Naive
+    # datetimes are taken as UTC.
+    offset = dt.utcoffset()
+    offset = 0 if offset is None else int(offset.total_seconds())//60
+    return (dt.toordinal() - EPOCH)*1440 + dt.hour*60 + dt.minute - offset
+
+def _jdate2datetime(
+    Jd: float,
+    n: int,
+    tzinfo: datetime.tzinfo|None,
+    table: 'OffsetTable|None'=None,
+) -> datetime.datetime:
+    return _minutes2datetime(n*1440 + jdate2time(Jd, n), tzinfo, table)
+
+def _offset(
+    tzinfo: datetime.tzinfo,
+    minutes: int,
+) -> int:
+    return int(_minutes2datetime(minutes, tzinfo).utcoffset().total_seconds())//60
+
+class OffsetTable:
+    # UTC offsets of *tzinfo* from the day before to the day after *year*, as
+    # a list of transitions, so that minutes since 2000-01-01 00:00 UTC turn
+    # into local `datetime`s without `astimezone()`. Transitions are found by
+    # sampling every day and bisecting: offsets are assumed to change at most
+    # once a day, as in real time zones.
+    def __init__(
+        self,
+        tzinfo: datetime.tzinfo,
+        year: int,
+    ) -> None:
+        self.tzinfo: datetime.tzinfo = tzinfo
+        self.year: int = year
+        self.start: int = (datetime.date(year, 1, 1).toordinal() - EPOCH - 1)*1440
+        self.end: int = (datetime.date(year + 1, 1, 1).toordinal() - EPOCH + 1)*1440
+        # offsets[i] applies from times[i] to times[i + 1]
+        self.times: array = array('l', [self.start])
+        self.offsets: array = array('h', [_offset(tzinfo, self.start)])
+        t = self.start
+        offset = self.offsets[0]
+        while t < self.end:
+            u = min(t + 1440, self.end)
+            if _offset(tzinfo, u) == offset:
+                t = u
+                continue
+            while u - t > 1:
+                m = (t + u)//2
+                if _offset(tzinfo, m) == offset:
+                    t = m
+                else:
+                    u = m
+            offset = _offset(tzinfo, u)
+            self.times.append(u)
+            self.offsets.append(offset)
+            t = u
+
+    def _index(
+        self,
+        minutes: int,
+    ) -> int:
+        times = self.times
+        lo = 0
+        hi = len(times)
+        while hi - lo > 1:
+            mid = (lo + hi)//2
+            if times[mid] <= minutes:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def offset(
+        self,
+        minutes: int,
+    ) -> int:
+        # UTC offset in minutes at *minutes* since 2000-01-01 00:00 UTC.
+        return self.offsets[self._index(minutes)]
+
+    def datetime(
+        self,
+        minutes: int,
+    ) -> datetime.datetime:
+        # Same as `_minutes2datetime(minutes, tzinfo)`.
+        i = self._index(minutes)
+        offset = self.offsets[i]
+        # second pass over local times repeated when clocks go back
+        fold = int(i > 0 and minutes - self.times[i] < self.offsets[i - 1] - offset)
+        days, minutes = divmod(minutes + offset, 1440)
+        return datetime.datetime(
+            0, 0, EPOCH + days,
+            microsecond=minutes*60_000_000,
+            tzinfo=self.tzinfo,
+            fold=fold)
+
+_tables: dict = {} # (id(tzinfo), year): OffsetTable
+
+def offset_table(
+    tzinfo: datetime.tzinfo,
+    year: int,
+) -> OffsetTable:
+    # Shared `OffsetTable` for *tzinfo* and *year*; a few are kept.
+    table = _tables.get((id(tzinfo), year))
+    if table is None or table.tzinfo is not tzinfo:
+        if len(_tables) >= 8:
+            _tables.clear()
+        table = _tables[(id(tzinfo), year)] = OffsetTable(tzinfo, year)
+    return table
+
+def jdate2datetime(
+    Jd: float,
+    date: datetime.datetime,
+) -> datetime.datetime:
+    return _jdate2datetime(Jd, date.toordinal() - EPOCH, date.tzinfo)
+
+def iter_sun_events(
+    latitude: float,
+    longitude: float,
+    altitude: int,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    tz: datetime.tzinfo|None=None,
+    offsets: bool=False,
+):
+    # Yield `(date, sunrise, sunset)` for each day from *start* to *end*
+    # (both included), as `Sundatetime` would compute them. Results are
+    # expressed in time zone *tz*, *start*'s one by default. If *offsets*,
+    # UTC offsets of *tz* are taken from an `OffsetTable` for each year.
+    if tz is None:
+        tz = start.tzinfo
+    n = start.toordinal() - EPOCH
+    stop = end.toordinal() - EPOCH
+    site = Site(latitude, longitude, altitude)
+    date = start
+    table = None
+    while n <= stop:
+        if offsets and tz is not None\
+                and (table is None or table.year != date.year):
+            table = offset_table(tz, date.year)
+        site.step(n)
+        yield date,\
+              _jdate2datetime(site.Jr, n, tz, table),\
+              _jdate2datetime(site.Js, n, tz, table)
+        n += 1
+        date += ONE_DAY
+
 class Sundatetime:
     def __init__(
         self,
         latitude: float,
         longitude: float,
         altitude: int=0,
+        cache: 'SunCache|None'=None,
+        offsets: bool=False,
+        solver=None,
     ) -> None:
         self.latitude: float = latitude
         self.longitude: float = longitude
         self.altitude: int = altitude
-        self.sunrise: datetime.datetime|None = None
-        self.sunset: datetime.datetime|None = None
+        self.cache: 'SunCache|None' = cache
+        # function with the same interface as `equation`, `None` for it
+        self.solver = solver
+        self.offsets: bool = offsets
+        self.tzinfo: datetime.tzinfo|None = None
+        self._table: OffsetTable|None = None
+        # minutes since 2000-01-01 00:00 UTC
+        self.sunrise_utc: int|None = None
+        self.sunset_utc: int|None = None
+        self._sunrise: datetime.datetime|None = None
+        self._sunset: datetime.datetime|None = None
+        # `NORMAL`, `POLAR_DAY` or `POLAR_NIGHT` for the last computed day
+        self.state: int|None = None
+        self._n: int|None = None
+        self._span: tuple[int, int]|None = None # last of `polar_span()`
+
+    @property
+    def sunrise(self) -> datetime.datetime|None:
+        if self._sunrise is None and self.sunrise_utc is not None:
+            self._sunrise = _minutes2datetime(self.sunrise_utc, self.tzinfo,
+                                              self._table)
+        return self._sunrise
+
+    @property
+    def sunset(self) -> datetime.datetime|None:
+        if self._sunset is None and self.sunset_utc is not None:
+            self._sunset = _minutes2datetime(self.sunset_utc, self.tzinfo,
+                                             self._table)
+        return self._sunset
 
     def calc_sunrise_sunset(
         self,
         date: datetime.datetime,
     ) -> None:
-        n = date.toordinal() - datetime.datetime(2000, 1, 1).toordinal()
-        Jr, Js = equation(n, self.latitude, self.longitude, self.altitude)
-        self.sunrise = jdate2datetime(Jr, date)
-        self.sunset  = jdate2datetime(Js, date)
+        # `datetime` results are built only when `sunrise` and `sunset` are
+        # read.
+        n = date.toordinal() - EPOCH
+        Jr, Js = self.solve(n)
+        self.tzinfo = date.tzinfo
+        self._table = offset_table(date.tzinfo, date.year)\
+            if self.offsets and date.tzinfo is not None else None
+        self.sunrise_utc = n*1440 + jdate2time(Jr, n)
+        self.sunset_utc  = n*1440 + jdate2time(Js, n)
+        self._sunrise = None
+        self._sunset = None
+        self.state = day_state(Jr, Js)
+        self._n = n
+
+    def polar_span(self) -> tuple[datetime.date, datetime.date]|None:
+        # Return `(first, last)` dates, both included, of the polar day or
+        # night of the last computed day, `None` if Sun rises and sets on it.
+        # The span is computed once for all of its days.
+        n = self._n
+        if n is None or self.state == NORMAL:
+            return None
+        span = self._span
+        if span is None or not span[0] <= n <= span[1]:
+            span = self._span = polar_span(self.solve, n)
+        return datetime.date.fromordinal(EPOCH + span[0]),\
+               datetime.date.fromordinal(EPOCH + span[1])
+
+    def calc_events(
+        self,
+        date: datetime.datetime,
+        angles: tuple[float, ...]=(HORIZON, CIVIL, NAUTICAL, ASTRONOMICAL),
+    ) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        # Default model of `equation_angles`, whatever `solver` and `cache`.
+        n = date.toordinal() - EPOCH
+        tz = date.tzinfo
+        return [(_jdate2datetime(Jr, n, tz), _jdate2datetime(Js, n, tz))
+                for Jr, Js in equation_angles(n, self.latitude,
+                    self.longitude, self.altitude, angles)]
+
+    def solve(
+        self,
+        n: int,
+    ) -> tuple[float, float]:
+        if self.cache is not None:
+            return self.cache.equation(
+                n, self.latitude, self.longitude, self.altitude, self.solver)
+        solver = equation if self.solver is None else self.solver
+        return solver(n, self.latitude, self.longitude, self.altitude)
+
+    def _event(
+        self,
+        now: datetime.datetime,
+        step: int,
+    ) -> tuple[datetime.datetime, bool]|None:
+        event = find_event(self.solve, _datetime2minutes(now), 0, step)
+        if event is None:
+            return None
+        n, Jd, rising = event
+        return _jdate2datetime(Jd, n, now.tzinfo), rising
+
+    def next_event(
+        self,
+        now: datetime.datetime,
+    ) -> tuple[datetime.datetime, bool]|None:
+        return self._event(now, 1)
+
+    def previous_event(
+        self,
+        now: datetime.datetime,
+    ) -> tuple[datetime.datetime, bool]|None:
+        return self._event(now, -1)
 
     def is_daytime (
         self,
         now: datetime.datetime,
     ) -> bool|None:
-        if self.sunrise is None or self.sunset is None:
+        sunrise = self.sunrise_utc
+        sunset = self.sunset_utc
+        if sunrise is None or sunset is None:
             return None
-        if self.sunrise >= self.sunset:
+        if sunrise >= sunset:
             return None
-        return self.sunrise <= now < self.sunset
+        return sunrise <= _datetime2minutes(now) < sunset
 
     def is_nighttime (
         self,
@@ -65,10 +319,18 @@ class Sundatetime:
         self,
         now: datetime.datetime,
     ) -> bool|None:
-        return self.is_daytime(now) and self.sunrise == now
+        return self.is_daytime(now) and self._is_minute(now, self.sunrise_utc)
 
     def is_sunset (
         self,
         now: datetime.datetime,
     ) -> bool|None:
-        return self.is_nighttime(now) and self.sunset == now
+        return self.is_nighttime(now) and self._is_minute(now, self.sunset_utc)
+
+    def _is_minute (
+        self,
+        now: datetime.datetime,
+        minutes: int|None,
+    ) -> bool:
+        return now.second == 0 and now.microsecond == 0\
+           and _datetime2minutes(now) == minutes
@@ -0,0 +1,102 @@
+# suntable.py
+
+from array import array
+import struct
+from . import equation, jdate2time
+from .suntime import day2000
+
+MAGIC = b'SUT2'
+HEADER = '<4siIddhh' # magic, first, days, latitude, longitude, altitude, timezone
+
+def _array(data) -> array:
+    a = array('h')
+    try:
+        a.frombytes(data)
+    except AttributeError: # MicroPython
+        # raw bytes are copied from `bytes` only, other buffers are iterated
+        a = array('h', bytes(data))
+    return a
+
+class SunTable:
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        altitude: int=0,
+        timezone: int=0,
+        first: int=0,
+        days: int=36525,
+    ) -> None:
+        self.latitude: float = latitude
+        self.longitude: float = longitude
+        self.altitude: int = altitude
+        self.timezone: int = timezone
+        self.first: int = first
+        self.sunrise: array = array('h')
+        self.sunset: array = array('h')
+        for n in range(first, first + days):
+            Jr, Js = equation(n, latitude, longitude, altitude)
+            self.sunrise.append(jdate2time(Jr, n, timezone))
+            self.sunset .append(jdate2time(Js, n, timezone))
+
+    @classmethod
+    def year(
+        cls,
+        latitude: float,
+        longitude: float,
+        altitude: int=0,
+        timezone: int=0,
+        year: int=2000,
+    ) -> 'SunTable':
+        first = day2000(year, 1, 1)
+        days = day2000(year, 12, 31) + 1 - first # 2400 is out of range
+        return cls(latitude, longitude, altitude, timezone, first, days)
+
+    def __len__(self) -> int:
+        return len(self.sunrise)
+
+    def __contains__(self, n: int) -> bool:
+        return 0 <= n - self.first < len(self.sunrise)
+
+    def lookup(
+        self,
+        n: int,
+    ) -> tuple[int, int]:
+        i = n - self.first
+        if not 0 <= i < len(self.sunrise):
+            raise IndexError(n)
+        return self.sunrise[i], self.sunset[i]
+
+    def to_bytes(self) -> bytes:
+        # Minutes are stored in the native byte order (little-endian on all
+        # MicroPython ports).
+        header = struct.pack(HEADER, MAGIC, self.first, len(self),
+            self.latitude, self.longitude, self.altitude, self.timezone)
+        return header + bytes(self.sunrise) + bytes(self.sunset)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        first: int|None=None,
+        days: int|None=None,
+    ) -> 'SunTable':
+        # Only days in [first; first + days) are loaded.
+        magic, first_, days_, latitude, longitude, altitude, timezone =\
+            struct.unpack_from(HEADER, data)
+        if magic != MAGIC:
+            raise ValueError("not a sun table")
+        if first is None:
+            first = first_
+        if days is None:
+            days = first_ + days_ - first
+        i = first - first_
+        if i < 0 or days < 0 or i + days > days_:
+            raise IndexError(first)
+        table = cls(latitude, longitude, altitude, timezone, first, 0)
+        data = memoryview(data)
+        offset = struct.calcsize(HEADER)
+        table.sunrise = _array(data[offset + 2*i:offset + 2*(i + days)])
+        offset += 2*days_
+        table.sunset  = _array(data[offset + 2*i:offset + 2*(i + days)])
+        return table
@@ -1,36 +1,96 @@
 # suntime.py
 
-from . import equation, jdate2time
+from . import ASTRONOMICAL, CIVIL, FIRST_DAY, HORIZON, LAST_DAY, NAUTICAL,\
+              NORMAL, POLAR_DAY, Site, day_state, equation_angles, find_event,\
+              jdate2time, polar_span
+
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def julian_day(
+    year: int,
+    month: int,
+    day: int,
+) -> int:
+    # Julian day number of a Gregorian date (Fliegel and Van Flandern, 1968).
+    m = -1 if month <= 2 else 0 # (M - 14)/12 truncated
+    return (1461*(year + 4800 + m))//4\
+         + (367*(month - 2 - 12*m))//12\
+         - (3*((year + 4900 + m)//100))//4\
+         + day - 32075
 
 def day2000(
     year: int,
     month: int,
     day: int,
 ) -> int:
-    assert(2000 <= year < 2100)
     assert(1 <= month <= 12)
     assert(1 <= day <= 31)
-    MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30)
+    if not 2000 <= year < 2100: # other centuries, see `FIRST_DAY`
+        n = julian_day(year, month, day) - 2451545
+        assert(FIRST_DAY <= n < LAST_DAY)
+        return n
     return (year - 2000)*365\
          + sum(MONTH_DAYS[:month - 1])\
          + (year if month >= 3 else year - 1)//4\
          + day\
          - 500 # 500 = 499 (non-leap years before 2000) + 1 (Jan 1st 2000)
 
+def iter_sun_events(
+    latitude: float,
+    longitude: float,
+    altitude: int,
+    start: tuple[int, int, int],
+    end: tuple[int, int, int],
+    tz: int=0,
+):
+    # Yield `((year, month, day), sunrise, sunset)` for each day from
+    # *start* to *end* (both included), as `Suntime` would compute them.
+    year, month, day = start
+    n = day2000(year, month, day)
+    stop = day2000(*end)
+    site = Site(latitude, longitude, altitude)
+    while n <= stop:
+        site.step(n)
+        yield (year, month, day),\
+              jdate2time(site.Jr, n, tz),\
+              jdate2time(site.Js, n, tz)
+        n += 1
+        day += 1
+        if day > MONTH_DAYS[month - 1] + (month == 2 and year%4 == 0
+                and (year%100 != 0 or year%400 == 0)):
+            day = 1
+            month += 1
+            if month > 12:
+                month = 1
+                year += 1
+
 class Suntime:
+    __slots__ = ('latitude', 'longitude', 'altitude', 'timezone', 'cache',
+                 'solver', 'site', 'n', 'sunrise', 'sunset', 'state', '_span')
+
     def __init__(
         self,
         latitude: float,
         longitude: float,
         altitude: int=0,
         timezone: int=0,
+        cache: 'SunCache|None'=None,
+        solver=None,
     ) -> None:
         self.latitude: float = latitude
         self.longitude: float = longitude
         self.altitude: int = altitude
         self.timezone: int = timezone
+        self.cache: 'SunCache|None' = cache
+        # function with the same interface as `equation`, `None` for `Site`
+        self.solver = solver
+        self.site: Site = Site(latitude, longitude, altitude)
+        self.n: int|None = None
         self.sunrise: int|None = None
         self.sunset: int|None = None
+        # `NORMAL`, `POLAR_DAY` or `POLAR_NIGHT` for day `n`
+        self.state: int|None = None
+        self._span: tuple[int, int]|None = None # last of `polar_span()`
 
     def calc_sunrise_sunset(
         self,
@@ -40,10 +100,115 @@ class Suntime:
         dst: int=0,
     ) -> None:
         n = day2000(year, month, day)
-        Jr, Js = equation(n, self.latitude, self.longitude, self.altitude)
         tz = self.timezone + dst
+        self.n = n
+        if self.cache is None and self.solver is None:
+            site = self.site
+            site.solve(n)
+            Jr, Js = site.Jr, site.Js
+        else:
+            Jr, Js = self.solve(n)
         self.sunrise = jdate2time(Jr, n, tz)
         self.sunset  = jdate2time(Js, n, tz)
+        self.state = day_state(Jr, Js)
+
+    def advance(
+        self,
+        days: int=1,
+        dst: int=0,
+    ) -> None:
+        # Same as `calc_sunrise_sunset()` for *days* after the last computed
+        # day; stepping one day at a time saves trigonometric functions.
+        assert self.n is not None
+        n = self.n + days
+        tz = self.timezone + dst
+        self.n = n
+        if self.solver is None:
+            site = self.site
+            site.step(n)
+            Jr, Js = site.Jr, site.Js
+        else:
+            Jr, Js = self.solve(n)
+        self.sunrise = jdate2time(Jr, n, tz)
+        self.sunset  = jdate2time(Js, n, tz)
+        self.state = day_state(Jr, Js)
+
+    def calc_events(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        angles: tuple[float, ...]=(HORIZON, CIVIL, NAUTICAL, ASTRONOMICAL),
+        dst: int=0,
+    ) -> list[tuple[int, int]]:
+        # Default model of `equation_angles`, whatever `solver` and `cache`.
+        n = day2000(year, month, day)
+        tz = self.timezone + dst
+        return [(jdate2time(Jr, n, tz), jdate2time(Js, n, tz))
+                for Jr, Js in equation_angles(n, self.latitude,
+                    self.longitude, self.altitude, angles)]
+
+    def solve(
+        self,
+        n: int,
+    ) -> tuple[float, float]:
+        if self.cache is not None:
+            return self.cache.equation(
+                n, self.latitude, self.longitude, self.altitude, self.solver)
+        if self.solver is not None:
+            return self.solver(n, self.latitude, self.longitude, self.altitude)
+        site = self.site
+        site.solve(n)
+        return site.Jr, site.Js
+
+    def polar_span(self) -> tuple[int, int]|None:
+        # Return `(first, last)` days since 2000-01-01, both included, of the
+        # polar day or night of the last computed day, `None` if Sun rises
+        # and sets on it. The span is computed once for all of its days.
+        if self.n is None or self.state == NORMAL:
+            return None
+        span = self._span
+        if span is None or not span[0] <= self.n <= span[1]:
+            span = self._span = polar_span(self.solve, self.n)
+        return span
+
+    def _event(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        minutes: int,
+        dst: int,
+        step: int,
+    ) -> tuple[int, int, bool]|None:
+        n0 = day2000(year, month, day)
+        tz = self.timezone + dst
+        event = find_event(self.solve, n0*1440 + minutes, tz, step)
+        if event is None:
+            return None
+        n, Jd, rising = event
+        days, minutes = divmod(n*1440 + jdate2time(Jd, n, tz), 1440)
+        return days - n0, minutes, rising
+
+    def next_event(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        minutes: int,
+        dst: int=0,
+    ) -> tuple[int, int, bool]|None:
+        return self._event(year, month, day, minutes, dst, 1)
+
+    def previous_event(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        minutes: int,
+        dst: int=0,
+    ) -> tuple[int, int, bool]|None:
+        return self._event(year, month, day, minutes, dst, -1)
 
     def is_daytime (
         self,
@@ -53,6 +218,8 @@ class Suntime:
             return None
         if not 0 <= minutes < 1440:
             return None
+        if self.state != NORMAL:
+            return self.state == POLAR_DAY
         return self.sunrise <= minutes < self.sunset
 
     def is_nighttime (
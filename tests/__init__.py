@@ -27,8 +27,13 @@ tz6 = ( 1, 1)
 tz7 = (13,-1)
 tz8 = (13, 0)
 
+PLACES = (pl1, pl2, pl3, pl4, pl5, pl6, pl7, pl8)
+DATES  = (dt1, dt2, dt3, dt4, dt5, dt6, dt7, dt8)
+TZS    = (tz1, tz2, tz3, tz4, tz5, tz6, tz7, tz8)
+
 __all__ = [
     "pl1", "pl2", "pl3", "pl4", "pl5", "pl6", "pl7", "pl8",
     "dt1", "dt2", "dt3", "dt4", "dt5", "dt6", "dt7", "dt8",
     "tz1", "tz2", "tz3", "tz4", "tz5", "tz6", "tz7", "tz8",
+    "PLACES", "DATES", "TZS",
 ]
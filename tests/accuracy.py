@@ -0,0 +1,84 @@
+# accuracy.py
+#
+# Compare solvers against `suntime.noaa.equation` at the places in
+# `tests/__init__.py`, every *step* days of the century. Run from the
+# repository root with either:
+#   python -m tests.accuracy [--json] [step]
+#   micropython -m tests.accuracy [--json] [step]
+#
+# For each solver and place, it reports the maximum and mean absolute error
+# of sunrise and sunset in minutes over days when both models agree on Sun
+# rising and setting, and the number of days when they disagree about polar
+# day or night.
+
+import sys
+from tests import *
+
+from suntime import NORMAL, day_state, equation, fast, jdate2time, noaa
+from suntime.fixed import FixedSite
+
+# pl6 and pl8 are the same places as pl5 and pl7
+UNIQUE = PLACES[:5] + PLACES[6:7]
+
+def time2jdate(minutes: int, n: int) -> float:
+    # Inverse of `jdate2time(Jd, n)`.
+    return 2451545 + n + (minutes - 720)/1440
+
+def fixed_equation(n: int, lat: float, lon: float, alt: float) -> tuple[float, float]:
+    site = FixedSite(lat, lon, alt)
+    site.solve(n)
+    return time2jdate(site.sunrise, n), time2jdate(site.sunset, n)
+
+# name: function with the same interface as `equation`
+SOLVERS = {
+    "equation": equation,
+    "fixed": fixed_equation,
+    "fast": fast.equation,
+}
+
+def tally(totals: list, days, got: list, ref: list) -> None:
+    # Add the errors of *got* against *ref*, lists of `(Jr, Js)` for each
+    # day in *days*, to *totals* `[count, total, worst, polar]`: minutes are
+    # compared when both agree on a normal day, otherwise `polar` counts the
+    # days whose states differ.
+    for n, (Jr, Js), (Rr, Rs) in zip(days, got, ref):
+        state = day_state(Rr, Rs)
+        if day_state(Jr, Js) != state:
+            totals[3] += 1
+        elif state == NORMAL:
+            for a, b in ((Jr, Rr), (Js, Rs)):
+                e = abs(jdate2time(a, n) - jdate2time(b, n))
+                totals[0] += 1
+                totals[1] += e
+                totals[2] = max(totals[2], e)
+
+def summary(totals: list) -> dict:
+    count, total, worst, polar = totals
+    return {"max": worst, "mean": round(total/count, 3) if count else 0,
+            "polar": polar}
+
+def compare(solver, place: tuple, step: int) -> dict:
+    days = range(0, 36525, step)
+    totals = [0, 0, 0, 0]
+    tally(totals, days,
+          [solver(n, place[0], place[1], 0) for n in days],
+          [noaa.equation(n, place[0], place[1], 0) for n in days])
+    return summary(totals)
+
+def run(step: int=7) -> dict:
+    results = {}
+    for name, solver in SOLVERS.items():
+        for place in UNIQUE:
+            results["%s/%r" % (name, place)] = compare(solver, place, step)
+    return {"step": step, "results": results}
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if not a.startswith('-')]
+    report = run(int(args[0]) if args else 7)
+    if "--json" in sys.argv:
+        import json
+        print(json.dumps(report))
+    else:
+        print("%-52s %6s %8s %6s" % ("solver/place", "max", "mean", "polar"))
+        for name, r in report["results"].items():
+            print("%-52s %6d %8.3f %6d" % (name, r["max"], r["mean"], r["polar"]))
@@ -0,0 +1,189 @@
+# benchmark.py
+#
+# Run from the repository root with either:
+#   python -m tests.benchmark [--json]
+#   micropython -m tests.benchmark [--json]
+#
+# For each benchmark, it reports time per call in nanoseconds, bytes
+# allocated per call and peak RAM in bytes. On MicroPython, allocations are
+# measured by `gc.mem_alloc()` with the garbage collector disabled; on
+# CPython, by `tracemalloc` (bytes held at the peak of a single call).
+
+import gc
+import sys
+from array import array
+from tests import *
+
+from suntime import Site, equation, jdate2time
+from suntime.suntime import Suntime, day2000
+from suntime import fast, fixed, noaa
+from suntime.instrument import ticks_ns, ticks_ns_diff
+from suntime.position import SolarPosition
+
+try:
+    import tracemalloc
+except ImportError: # MicroPython
+    tracemalloc = None
+
+try:
+    import datetime
+    from suntime.sundatetime import Sundatetime, iter_sun_events, jdate2datetime
+except ImportError:
+    datetime = None
+
+try:
+    from suntime.service import SunService
+except ImportError: # MicroPython
+    SunService = None
+
+GRID   = [(lat, lon) for lat in range(-80, 81, 10)
+                     for lon in range(-180, 180, 30)]
+GRID_DATES = ((2000, 3, 20), (2025, 6, 21), (2050, 9, 22), (2099, 12, 21))
+
+def measure(func, args, repeat: int=100) -> dict:
+    calls = repeat*len(args)
+    gc.collect()
+    t0 = ticks_ns()
+    for _ in range(repeat):
+        for a in args:
+            func(*a)
+    ns = ticks_ns_diff(ticks_ns(), t0)/calls
+
+    gc.collect()
+    if tracemalloc is None:
+        gc.disable()
+        try:
+            m0 = gc.mem_alloc()
+            for a in args:
+                func(*a)
+            peak = gc.mem_alloc()
+        finally:
+            gc.enable()
+        alloc = (peak - m0)/len(args)
+    else:
+        tracemalloc.start()
+        try:
+            alloc = 0
+            for a in args:
+                tracemalloc.reset_peak()
+                m0 = tracemalloc.get_traced_memory()[0]
+                func(*a)
+                alloc += tracemalloc.get_traced_memory()[1] - m0
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        alloc /= len(args)
+    return {"ns": round(ns, 1), "alloc": round(alloc, 1), "peak": peak}
+
+def cases(places, dates, tzs) -> dict:
+    ns = [day2000(*dt) for dt in dates]
+    args = [(n, pl[0], pl[1], 0) for n, pl in zip(ns, places)]
+    jds = [equation(*a) for a in args]
+    cases = {
+        "day2000": (day2000, dates),
+        # outside the fast path for [2000; 2100)
+        "day2000/extended": (day2000, [(y - 300, m, d) for y, m, d in dates]),
+        "equation": (equation, args),
+        "Site.solve": (Site.solve,
+            [(Site(*pl), n) for n, pl in zip(ns, places)]),
+        # consecutive days of one year, each place in turn
+        "Site.step": (Site.step,
+            [(site, n) for site in [Site(*pl) for pl in places[:8]]
+                       for n in range(365)]),
+        "jdate2time": (jdate2time,
+            [(jd[0], n, tz[0]*60) for jd, n, tz in zip(jds, ns, tzs)]),
+        "Suntime.calc_sunrise_sunset": (Suntime.calc_sunrise_sunset,
+            [(Suntime(*pl, timezone=tz[0]*60),) + dt + (tz[1]*60,)
+             for pl, dt, tz in zip(places, dates, tzs)]),
+        "fast.equation": (fast.equation, args),
+        "Suntime.calc_sunrise_sunset+fast": (Suntime.calc_sunrise_sunset,
+            [(Suntime(*pl, timezone=tz[0]*60, solver=fast.equation),) + dt
+             + (tz[1]*60,) for pl, dt, tz in zip(places, dates, tzs)]),
+        "noaa.equation": (noaa.equation, args),
+        "Suntime.calc_sunrise_sunset+noaa": (Suntime.calc_sunrise_sunset,
+            [(Suntime(*pl, timezone=tz[0]*60, solver=noaa.equation),) + dt
+             + (tz[1]*60,) for pl, dt, tz in zip(places, dates, tzs)]),
+        # terms of the day are computed by the first call only
+        "SolarPosition.at": (SolarPosition.at,
+            [(SolarPosition(*pl), n*86400 + 43200) for n, pl in zip(ns, places)]),
+        # one hour sampled every minute
+        "SolarPosition.at_array": (SolarPosition.at_array,
+            [(SolarPosition(*pl), array('d', range(n*86400, n*86400 + 3600, 60)))
+             for n, pl in zip(ns, places)]),
+        "FixedSite.solve": (fixed.FixedSite.solve,
+            [(fixed.FixedSite(*pl), n) for n, pl in zip(ns, places)]),
+        "fixed.Suntime.calc_sunrise_sunset": (fixed.Suntime.calc_sunrise_sunset,
+            [(fixed.Suntime(*pl, timezone=tz[0]*60),) + dt + (tz[1]*60,)
+             for pl, dt, tz in zip(places, dates, tzs)]),
+    }
+    if SunService is not None:
+        # cached after the first call
+        service = SunService()
+        cases["SunService.query"] = (service.query,
+            [pl + (dt, 0, tz[0]*60, tz[1]*60)
+             for pl, dt, tz in zip(places, dates, tzs)])
+    if datetime is not None:
+        dts = [datetime.datetime(*dt, tzinfo=datetime.timezone(
+                   datetime.timedelta(hours=tz[0])))
+               for dt, tz in zip(dates, tzs)]
+        cases["jdate2datetime"] = (jdate2datetime,
+            [(jd[0], d) for jd, d in zip(jds, dts)])
+        cases["Sundatetime.calc_sunrise_sunset"] = (
+            Sundatetime.calc_sunrise_sunset,
+            [(Sundatetime(*pl), d) for pl, d in zip(places, dts)])
+        # `datetime` objects are built on first read of sunrise/sunset
+        cases["Sundatetime.calc_sunrise_sunset+read"] = (calc_read,
+            [(Sundatetime(*pl), d) for pl, d in zip(places, dts)])
+        # 31 days of sunrise/sunset, UTC offsets from tzinfo or from a table
+        cases["iter_sun_events"] = (calendar,
+            [(pl, d, False) for pl, d in zip(places, dts)])
+        cases["iter_sun_events+offsets"] = (calendar,
+            [(pl, d, True) for pl, d in zip(places, dts)])
+    return cases
+
+def calendar(place, start, offsets) -> None:
+    for _ in iter_sun_events(place[0], place[1], 0, start,
+                             start + datetime.timedelta(days=30),
+                             offsets=offsets):
+        pass
+
+def calc_read(sd, date) -> None:
+    sd.calc_sunrise_sunset(date)
+    sd.sunrise
+    sd.sunset
+
+def run(repeat: int=100) -> dict:
+    grid_places = [pl for pl in GRID for _ in GRID_DATES]
+    grid_dates = [dt for _ in GRID for dt in GRID_DATES]
+    suites = {
+        "fixtures": cases(PLACES, DATES, TZS),
+        "grid": cases(grid_places, grid_dates, [(0, 0)]*len(grid_dates)),
+    }
+    results = {}
+    for suite, benchmarks in suites.items():
+        for name, (func, args) in benchmarks.items():
+            try:
+                r = measure(func, args, repeat if suite == "fixtures" else 1)
+            except Exception as e: # e.g. `datetime` not fully supported
+                r = {"error": repr(e)}
+            results[suite + "/" + name] = r
+    return {
+        "implementation": sys.implementation.name,
+        "version": ".".join(str(v) for v in sys.implementation.version[:3]),
+        "results": results,
+    }
+
+if __name__ == '__main__':
+    report = run()
+    if "--json" in sys.argv:
+        import json
+        print(json.dumps(report))
+    else:
+        print(report["implementation"], report["version"])
+        print("%-44s %10s %10s %10s" % ("benchmark", "ns/call", "B/call", "peak B"))
+        for name, r in report["results"].items():
+            if "error" in r:
+                print("%-44s %s" % (name, r["error"]))
+            else:
+                print("%-44s %10.1f %10.1f %10d"
+                      % (name, r["ns"], r["alloc"], r["peak"]))
@@ -0,0 +1,87 @@
+# imports.py
+#
+# Measure time and RAM taken by importing each variant of the library, each
+# in a fresh interpreter. Run from the repository root with either:
+#   python -m tests.imports [--json]
+#   micropython -m tests.imports suntime.suntime [--json]
+#
+# With no module, CPython runs one subprocess per variant in `VARIANTS`;
+# MicroPython has no subprocesses, so run it once per module. RAM is what
+# is still allocated after the import and a garbage collection.
+
+import gc
+import sys
+
+# Same clock as `suntime.instrument`, which cannot be imported here: it
+# would load the package before its import is measured.
+try:
+    from time import ticks_diff, ticks_us
+    def ticks_ns() -> int:
+        return ticks_us()*1000
+    def ticks_ns_diff(a: int, b: int) -> int:
+        return ticks_diff(a//1000, b//1000)*1000
+    tracemalloc = None
+except ImportError: # CPython
+    from time import perf_counter_ns as ticks_ns
+    def ticks_ns_diff(a: int, b: int) -> int:
+        return a - b
+    import tracemalloc
+
+VARIANTS = (
+    'suntime',
+    'suntime.suntime',
+    'suntime.fixed',
+    'suntime.position',
+    'suntime.suntable',
+    'suntime.cache',
+    'suntime.sundatetime',
+    'suntime.scheduler',
+)
+
+def measure(module: str) -> dict:
+    gc.collect()
+    if tracemalloc is None:
+        m0 = gc.mem_alloc()
+    else:
+        tracemalloc.start()
+        m0 = tracemalloc.get_traced_memory()[0]
+    t0 = ticks_ns()
+    __import__(module)
+    ns = ticks_ns_diff(ticks_ns(), t0)
+    gc.collect()
+    if tracemalloc is None:
+        ram = gc.mem_alloc() - m0
+    else:
+        ram = tracemalloc.get_traced_memory()[0] - m0
+        tracemalloc.stop()
+    return {"ns": ns, "ram": ram}
+
+def run(modules) -> dict:
+    results = {}
+    for module in modules:
+        if len(modules) == 1:
+            results[module] = measure(module)
+        else:
+            import json
+            import subprocess
+            out = subprocess.run([sys.executable, '-m', 'tests.imports',
+                                  module, '--json'],
+                                 capture_output=True, check=True).stdout
+            results.update(json.loads(out)["results"])
+    return {
+        "implementation": sys.implementation.name,
+        "version": ".".join(str(v) for v in sys.implementation.version[:3]),
+        "results": results,
+    }
+
+if __name__ == '__main__':
+    modules = [a for a in sys.argv[1:] if not a.startswith('-')] or VARIANTS
+    report = run(modules)
+    if "--json" in sys.argv:
+        import json
+        print(json.dumps(report))
+    else:
+        print(report["implementation"], report["version"])
+        print("%-24s %12s %10s" % ("module", "ns", "RAM B"))
+        for name, r in report["results"].items():
+            print("%-24s %12d %10d" % (name, r["ns"], r["ram"]))
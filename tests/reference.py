@@ -0,0 +1,128 @@
+# reference.py
+#
+# Reference sunrise and sunset over a global grid of places and the whole
+# century, and a harness comparing solvers against it. Run from the
+# repository root with either:
+#   python -m tests.reference [--json] [--lat LIMIT]
+#   micropython -m tests.reference [--json] [--lat LIMIT]
+# and regenerate the dataset (CPython, a few seconds) with:
+#   python -m tests.reference --generate
+#
+# The dataset is computed by `suntime.noaa.equation` iterated to
+# convergence, the most accurate model at hand; it is therefore the
+# reference and not among the solvers checked, which would be circular.
+# File `reference.bin` is a header (see `HEADER`) followed, for each place
+# (latitude-major), by `days` minutes of sunrise and then `days` minutes of
+# sunset since 00:00 UTC, as little-endian 16-bit integers (same layout as
+# `suntime.grid`).
+#
+# For each solver in `SOLVERS`, it reports the maximum and mean absolute
+# error in minutes over days when both agree on Sun rising and setting, the
+# number of days when they disagree about polar day or night, and the time
+# per call. `--lat LIMIT` only keeps places with |latitude| ≤ LIMIT.
+
+import struct
+import sys
+from array import array
+from tests.accuracy import SOLVERS, summary, tally, time2jdate
+
+from suntime import jdate2time, noaa
+from suntime.instrument import ticks_ns, ticks_ns_diff
+
+PATH = __file__.rsplit('/', 1)[0] + '/reference.bin'
+MAGIC = b'SUNR'
+# magic, first latitude, latitude step, latitudes, first longitude,
+# longitude step, longitudes, day step, days (from 2000-01-01)
+HEADER = '<4shhhhhhhh'
+HEADER_SIZE = struct.calcsize(HEADER)
+
+LATITUDES = range(-80, 81, 10)
+LONGITUDES = range(-180, 180, 30)
+DAYS = range(0, 36525, 173) # a prime step, to sample every season and year
+ITERATIONS = 8 # of `noaa.equation`, enough for convergence
+
+def places() -> list:
+    return [(lat, lon) for lat in LATITUDES for lon in LONGITUDES]
+
+def generate(path: str=PATH) -> None:
+    iterations = noaa.ITERATIONS
+    noaa.ITERATIONS = ITERATIONS
+    try:
+        data = array('h')
+        for lat, lon in places():
+            events = [noaa.equation(n, lat, lon, 0) for n in DAYS]
+            data.extend(jdate2time(Jr, n) for (Jr, _), n in zip(events, DAYS))
+            data.extend(jdate2time(Js, n) for (_, Js), n in zip(events, DAYS))
+    finally:
+        noaa.ITERATIONS = iterations
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(path, 'wb') as f:
+        f.write(struct.pack(HEADER, MAGIC,
+            LATITUDES[0], LATITUDES.step, len(LATITUDES),
+            LONGITUDES[0], LONGITUDES.step, len(LONGITUDES),
+            DAYS.step, len(DAYS)))
+        f.write(data)
+
+def load(path: str=PATH) -> array:
+    # Return sunrise and sunset minutes, checking the grid in the header.
+    with open(path, 'rb') as f:
+        header = struct.unpack(HEADER, f.read(HEADER_SIZE))
+        if header != (MAGIC,
+                LATITUDES[0], LATITUDES.step, len(LATITUDES),
+                LONGITUDES[0], LONGITUDES.step, len(LONGITUDES),
+                DAYS.step, len(DAYS)):
+            raise ValueError("reference grid mismatch, regenerate it")
+        data = array('h', f.read())
+    if sys.byteorder != 'little':
+        data.byteswap()
+    assert(len(data) == 2*len(LATITUDES)*len(LONGITUDES)*len(DAYS))
+    return data
+
+def compare(solver, data: array, limit: float=90) -> dict:
+    totals = [0, 0, 0, 0]
+    calls = ns = 0
+    days = len(DAYS)
+    for i, (lat, lon) in enumerate(places()):
+        if abs(lat) > limit:
+            continue
+        t0 = ticks_ns()
+        got = [solver(n, lat, lon, 0) for n in DAYS]
+        ns += ticks_ns_diff(ticks_ns(), t0)
+        calls += days
+        base = 2*days*i
+        ref = [(time2jdate(data[base + k], n), time2jdate(data[base + days + k], n))
+               for k, n in enumerate(DAYS)]
+        tally(totals, DAYS, got, ref)
+    result = summary(totals)
+    result["ns"] = round(ns/calls, 1) if calls else 0
+    return result
+
+def run(limit: float=90, solvers=None) -> dict:
+    data = load()
+    results = {}
+    for name in solvers or SOLVERS:
+        results[name] = compare(SOLVERS[name], data, limit)
+    return {
+        "implementation": sys.implementation.name,
+        "lat": limit,
+        "results": results,
+    }
+
+if __name__ == '__main__':
+    if "--generate" in sys.argv:
+        generate()
+    else:
+        limit = 90
+        if "--lat" in sys.argv:
+            limit = float(sys.argv[sys.argv.index("--lat") + 1])
+        report = run(limit)
+        if "--json" in sys.argv:
+            import json
+            print(json.dumps(report))
+        else:
+            print(report["implementation"], "|latitude| <=", report["lat"])
+            print("%-12s %6s %8s %6s %10s" % ("solver", "max", "mean", "polar", "ns/call"))
+            for name, r in report["results"].items():
+                print("%-12s %6d %8.3f %6d %10.1f"
+                      % (name, r["max"], r["mean"], r["polar"], r["ns"]))
@@ -0,0 +1,46 @@
+# test_batch.py
+
+import unittest
+from tests import *
+
+from suntime import equation
+from suntime.suntime import day2000
+from suntime import batch
+from suntime.batch import equation_array, equation_batch, equation_numpy
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.n   = [day2000(*dt) for dt in DATES]
+        self.lat = [pl[0] for pl in PLACES]
+        self.lon = [pl[1] for pl in PLACES]
+        self.alt = [0, 10, 0, 200, 0, 1000, 0, 50]
+
+    def test_array(self):
+        Jr, Js = equation_array(self.n, self.lat, self.lon, self.alt)
+        for i in range(len(self.n)):
+            self.assertEqual((Jr[i], Js[i]),
+                equation(self.n[i], self.lat[i], self.lon[i], self.alt[i]))
+
+    def test_array_scalars(self):
+        Jr, Js = equation_array(range(365), pl1[0], pl1[1])
+        self.assertEqual(len(Jr), 365)
+        for n in (0, 100, 364):
+            self.assertEqual((Jr[n], Js[n]), equation(n, *pl1, 0))
+
+    @unittest.skipIf(batch.numpy is None, "numpy not installed")
+    def test_numpy(self):
+        Jr, Js = equation_numpy(self.n, self.lat, self.lon, self.alt)
+        for i in range(len(self.n)):
+            jr, js = equation(self.n[i], self.lat[i], self.lon[i], self.alt[i])
+            self.assertAlmostEqual(Jr[i], jr, places=7)
+            self.assertAlmostEqual(Js[i], js, places=7)
+
+    def test_batch(self):
+        Jr, Js = equation_batch(self.n, self.lat, self.lon, self.alt)
+        self.assertEqual(len(Jr), len(self.n))
+        self.assertEqual(len(Js), len(self.n))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,74 @@
+# test_cache.py
+
+import unittest
+from tests import *
+
+from suntime import equation
+from suntime import cache as _cache
+from suntime.cache import SunCache
+from suntime.suntime import Suntime, day2000
+
+
+class TestSunCache(unittest.TestCase):
+
+    def test_equation(self):
+        cache = SunCache()
+        n = day2000(*dt1)
+        self.assertEqual(cache.equation(n, *pl1, 0), equation(n, *pl1, 0))
+        self.assertEqual(cache.equation(n, *pl1, 0), equation(n, *pl1, 0))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 1)
+
+    def check_lru(self, cache):
+        cache.equation(0, *pl1, 0)
+        cache.equation(1, *pl1, 0)
+        cache.equation(0, *pl1, 0) # 0 is now the most recently used
+        cache.equation(2, *pl1, 0) # 1 is dropped
+        self.assertEqual(len(cache), 2)
+        cache.equation(0, *pl1, 0)
+        cache.equation(1, *pl1, 0)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_lru(self):
+        self.check_lru(SunCache(2))
+
+    def test_lru_fallback(self):
+        # without `collections.OrderedDict`, e.g. on some MicroPython builds
+        cache = SunCache(2)
+        cache._data = _cache._OrderedDict()
+        self.check_lru(cache)
+        cache = SunCache(3)
+        cache._data = _cache._OrderedDict()
+        for n in (0, 1, 2, 0, 3, 4):
+            cache.equation(n, *pl1, 0)
+        self.assertEqual([key[0] for key in cache._data], [0, 3, 4])
+
+    def test_disabled(self):
+        cache = SunCache(0)
+        cache.equation(0, *pl1, 0)
+        cache.equation(0, *pl1, 0)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_resize_clear(self):
+        cache = SunCache()
+        for n in range(10):
+            cache.equation(n, *pl1, 0)
+        cache.resize(3)
+        self.assertEqual(len(cache), 3)
+        cache.equation(9, *pl1, 0)
+        self.assertEqual(cache.hits, 1)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_shared(self):
+        cache = SunCache(4)
+        st1 = Suntime(*pl1, timezone=tz1[0]*60, cache=cache)
+        st2 = Suntime(*pl1, timezone=tz1[0]*60, cache=cache)
+        st1.calc_sunrise_sunset(*dt1, dst=tz1[1]*60)
+        st2.calc_sunrise_sunset(*dt1, dst=tz1[1]*60)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual((st2.sunrise, st2.sunset), (7*60 + 40, 16*60 + 47))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,33 @@
+# test_fast.py
+
+import unittest
+from tests import *
+
+from suntime import equation, fast, jdate2time
+from suntime.suntime import Suntime
+
+
+class TestFast(unittest.TestCase):
+
+    def test_fixtures(self):
+        for pl, dt, tz in zip(PLACES, DATES, TZS):
+            st = Suntime(*pl, timezone=tz[0]*60)
+            st.calc_sunrise_sunset(*dt, dst=tz[1]*60)
+            fst = Suntime(*pl, timezone=tz[0]*60, solver=fast.equation)
+            fst.calc_sunrise_sunset(*dt, dst=tz[1]*60)
+            self.assertEqual((fst.sunrise, fst.sunset, fst.state),
+                             (st.sunrise, st.sunset, st.state))
+
+    def test_minutes(self):
+        # same minutes as `equation` over the supported range, altitudes and
+        # latitudes up to the poles
+        for lat in range(-89, 90, 8):
+            for n in range(-146097, 146097, 211):
+                for alt in (0, 500):
+                    a = equation(n, lat + 0.5, 12.4360233, alt)
+                    b = fast.equation(n, lat + 0.5, 12.4360233, alt)
+                    self.assertEqual([jdate2time(J, n) for J in a],
+                                     [jdate2time(J, n) for J in b])
+
+if __name__ == '__main__':
+        unittest.main()
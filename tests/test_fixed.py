@@ -0,0 +1,71 @@
+# test_fixed.py
+
+import math
+import unittest
+from tests import *
+
+from suntime import NORMAL, POLAR_DAY, POLAR_NIGHT, Site, jdate2time
+from suntime.fixed import FixedSite, Suntime, iatan2, isin, isqrt
+import suntime.suntime
+
+
+class TestFixed(unittest.TestCase):
+
+    def test_isin(self):
+        for a in range(-65536, 65536*2, 97):
+            self.assertLessEqual(abs(isin(a) - round(16384*math.sin(a*math.pi/32768))), 1)
+
+    def test_isqrt(self):
+        for x in (0, 1, 2, 3, 4, 15, 16, 17, 1000, 16383*16383, 1 << 28):
+            r = isqrt(x)
+            self.assertLessEqual(r*r, x)
+            self.assertGreater((r + 1)*(r + 1), x)
+
+    def test_iatan2(self):
+        for x, y in ((16384, 0), (0, 16384), (-16384, 1), (-3000, 2000), (100, 50)):
+            exact = math.atan2(y, x)*32768/math.pi
+            self.assertLessEqual(abs(iatan2(y, x) - exact), 2)
+
+    def test_fixtures(self):
+        for pl, dt, tz in ((pl1, dt1, tz1), (pl2, dt2, tz2), (pl3, dt3, tz3), (pl4, dt4, tz4)):
+            st = Suntime(*pl, timezone=tz[0]*60)
+            ref = suntime.suntime.Suntime(*pl, timezone=tz[0]*60)
+            st.calc_sunrise_sunset(*dt, dst=tz[1]*60)
+            ref.calc_sunrise_sunset(*dt, dst=tz[1]*60)
+            self.assertLessEqual(abs(st.sunrise - ref.sunrise), 1)
+            self.assertLessEqual(abs(st.sunset  - ref.sunset ), 1)
+            ref.advance(10)
+            st.advance(10)
+            self.assertLessEqual(abs(st.sunrise - ref.sunrise), 1)
+            self.assertLessEqual(abs(st.sunset  - ref.sunset ), 1)
+
+    def test_bound(self):
+        # ±1 minute within 65° of latitude, less the dip of the horizon due
+        # to altitude, over the whole century
+        for alt in (0, 500, 2000, 5000):
+            limit = 65 - 2.076*math.sqrt(alt)/60
+            for i in range(-5, 6):
+                lat = limit*i/5
+                for lon in range(-180, 180, 71):
+                    fixed = FixedSite(lat, lon, alt)
+                    site = Site(lat, lon, alt)
+                    for n in range(0, 36525, 97):
+                        fixed.solve(n)
+                        site.solve(n)
+                        self.assertLessEqual(abs(fixed.sunrise - jdate2time(site.Jr, n)), 1)
+                        self.assertLessEqual(abs(fixed.sunset  - jdate2time(site.Js, n)), 1)
+
+    def test_polar(self):
+        st = Suntime(*pl5)
+        st.calc_sunrise_sunset(*dt5)
+        self.assertGreater(st.sunset - st.sunrise, 1440) # polar day
+        self.assertEqual(st.state, POLAR_DAY)
+        st = Suntime(*pl7)
+        st.calc_sunrise_sunset(*dt7)
+        self.assertLess(st.sunset - st.sunrise, -1440) # polar night
+        self.assertEqual(st.state, POLAR_NIGHT)
+        st.calc_sunrise_sunset(*dt8)
+        self.assertEqual(st.state, NORMAL)
+
+if __name__ == '__main__':
+        unittest.main()
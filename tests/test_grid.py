@@ -0,0 +1,118 @@
+# test_grid.py
+
+import os
+import struct
+import tempfile
+import unittest
+from tests import *
+
+from suntime import equation, jdate2time
+from suntime.grid import HEADER_SIZE, SunTableIndex, main, merge, unpack_header,\
+                         year_days
+from suntime.suntime import Suntime, day2000
+
+
+class TestGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, path, lat0, lon0, step, nlat, nlon, year):
+        with open(path, 'rb') as f:
+            data = f.read()
+        first, days = year_days(year)
+        self.assertEqual(unpack_header(data),
+                         (year, days, lat0, lon0, step, nlat, nlon))
+        self.assertEqual(len(data), HEADER_SIZE + nlat*nlon*4*days)
+        for i, j, d in ((0, 0, 0), (nlat - 1, nlon - 1, days - 1), (1, 2, 171)):
+            st = Suntime(lat0 + step*i, lon0 + step*j)
+            n = first + d
+            offset = HEADER_SIZE + (i*nlon + j)*4*days + 2*d
+            sunrise, = struct.unpack_from('<h', data, offset)
+            sunset,  = struct.unpack_from('<h', data, offset + 2*days)
+            Jr, Js = st.solve(n)
+            self.assertEqual((sunrise, sunset), (jdate2time(Jr, n), jdate2time(Js, n)))
+
+    def test_grid(self):
+        out = os.path.join(self.dir, "grid.sun")
+        main(["--lat", "60", "80", "--lon", "-10", "10", "--step", "5",
+              "--year", "2021", "--out", self.dir, "--jobs", "2",
+              "--shards", "3", "--merge", out])
+        shards = sorted(p for p in os.listdir(self.dir) if p.startswith("shard"))
+        self.assertEqual(len(shards), 3)
+        self.check(out, 60.0, -10.0, 5.0, 5, 5, 2021)
+        self.check(os.path.join(self.dir, shards[1]), 65.0, -10.0, 5.0, 2, 5, 2021)
+
+    def test_grid_range(self):
+        # first and last year of the supported range
+        for year in (1600, 2399):
+            out = os.path.join(self.dir, "grid%d.sun" % year)
+            main(["--lat", "40", "45", "--lon", "0", "10", "--step", "5",
+                  "--year", str(year), "--out", self.dir, "--jobs", "1",
+                  "--shards", "1", "--merge", out])
+            self.check(out, 40.0, 0.0, 5.0, 2, 3, year)
+
+    def test_merge_incompatible(self):
+        main(["--lat", "0", "10", "--lon", "0", "10", "--step", "5",
+              "--year", "2021", "--out", self.dir, "--jobs", "1", "--shards", "1"])
+        other = os.path.join(self.dir, "other")
+        main(["--lat", "15", "15", "--lon", "0", "5", "--step", "5",
+              "--year", "2021", "--out", other, "--jobs", "1", "--shards", "1"])
+        self.assertRaises(ValueError, merge,
+            [os.path.join(self.dir, "shard-0000.sun"),
+             os.path.join(other, "shard-0000.sun")],
+            os.path.join(self.dir, "out.sun"))
+
+class TestSunTableIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "grid.sun")
+        main(["--lat", "40", "80", "--lon", "0", "20", "--step", "2",
+              "--year", "2040", "--out", cls.tmp.name, "--jobs", "1",
+              "--merge", cls.path])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def exact(self, lat, lon, *date):
+        n = day2000(*date)
+        Jr, Js = equation(n, lat, lon, 0)
+        return jdate2time(Jr, n), jdate2time(Js, n)
+
+    def test_grid_points(self):
+        with SunTableIndex(self.path) as index:
+            for lat, lon in ((40, 0), (52, 14), (80, 20)):
+                for date in ((2040, 1, 1), (2040, 6, 21), (2040, 12, 31)):
+                    self.assertEqual(index.lookup(lat, lon, *date),
+                                     self.exact(lat, lon, *date))
+
+    def test_nearest(self):
+        with SunTableIndex(self.path) as index:
+            self.assertEqual(index.lookup(52.9, 13.2, *dt5),
+                             self.exact(52, 14, *dt5))
+
+    def test_bilinear(self):
+        with SunTableIndex(self.path, 'bilinear') as index:
+            for lat, lon in ((42.5966460, 12.4360233), (55.1, 2.3)):
+                sunrise, sunset = index.lookup(lat, lon, *dt5)
+                exact = self.exact(lat, lon, *dt5)
+                self.assertLessEqual(abs(sunrise - exact[0]), 2)
+                self.assertLessEqual(abs(sunset  - exact[1]), 2)
+            # polar day nearby: nearest grid point
+            self.assertEqual(index.lookup(pl5[0], pl5[1], *dt5),
+                             index.point(19, 8, day2000(*dt5) - day2000(2040, 1, 1)))
+
+    def test_fallback(self):
+        with SunTableIndex(self.path, 'bilinear') as index:
+            self.assertEqual(index.lookup(*pl3, *dt3), self.exact(*pl3, *dt3))
+            self.assertEqual(index.lookup(*pl1, *dt1), self.exact(*pl1, *dt1))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,39 @@
+# test_imports.py
+
+import subprocess
+import sys
+import unittest
+
+import suntime
+from suntime.suntime import Suntime
+from tests.imports import run
+
+
+class TestImports(unittest.TestCase):
+
+    def modules(self, code):
+        out = subprocess.run([sys.executable, '-c', code + '\nimport sys\n'
+                              'print(" ".join(sorted(sys.modules)))'],
+                             capture_output=True, check=True, text=True)
+        return out.stdout.split()
+
+    def test_lazy(self):
+        modules = self.modules('import suntime')
+        self.assertNotIn('datetime', modules)
+        self.assertNotIn('suntime.suntime', modules)
+        modules = self.modules('import suntime; suntime.Suntime')
+        self.assertIn('suntime.suntime', modules)
+        self.assertNotIn('suntime.sundatetime', modules)
+        self.assertIs(suntime.Suntime, Suntime)
+        self.assertIsNotNone(suntime.SunCache)
+        self.assertRaises(AttributeError, getattr, suntime, 'Moontime')
+
+    def test_measure(self):
+        report = run(('suntime', 'suntime.fixed'))
+        self.assertEqual(set(report["results"]), {'suntime', 'suntime.fixed'})
+        for r in report["results"].values():
+            self.assertGreater(r["ns"], 0)
+            self.assertGreater(r["ram"], 0)
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,74 @@
+# test_instrument.py
+
+import subprocess
+import sys
+import unittest
+from tests import *
+
+import suntime
+import suntime.cache
+import suntime.suntable
+from suntime import Site, equation, instrument, jdate2time
+from suntime.cache import SunCache
+from suntime.suntime import Suntime
+
+
+class TestInstrument(unittest.TestCase):
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def originals(self):
+        return (suntime.equation, suntime.jdate2time, suntime.cache.equation,
+                suntime.suntable.equation, Site.solve, Site.step,
+                Suntime.calc_sunrise_sunset)
+
+    def test_disabled(self):
+        # disabled, the very same functions are called: no overhead
+        originals = (equation, jdate2time, equation, equation,
+                     Site.solve, Site.step, Suntime.calc_sunrise_sunset)
+        self.assertEqual(self.originals(), originals)
+        instrument.enable()
+        self.assertTrue(all(a is not b for a, b in zip(self.originals(), originals)))
+        instrument.disable()
+        self.assertTrue(all(a is b for a, b in zip(self.originals(), originals)))
+        Suntime(*pl1).calc_sunrise_sunset(*dt1)
+        self.assertEqual(suntime.stats()['calls'], {})
+
+    def test_imported_while_enabled(self):
+        # modules imported after `enable()` are restored by `disable()` too
+        out = subprocess.run([sys.executable, '-c',
+            'import suntime\n'
+            'from suntime import equation, instrument\n'
+            'instrument.enable()\n'
+            'from suntime import siteset, suntable\n'
+            'wrapped = suntable.equation is not equation\n'
+            'instrument.disable()\n'
+            'suntable.SunTable(*%r, days=2)\n'
+            'print(wrapped, suntable.equation is equation,\n'
+            '      siteset.equation is equation, suntime.stats()["calls"])'
+            % (pl1,)], capture_output=True, check=True, text=True)
+        self.assertEqual(out.stdout.split(), ['True', 'True', 'True', '{}'])
+
+    def test_stats(self):
+        instrument.enable()
+        st = Suntime(*pl5)
+        st.calc_sunrise_sunset(*dt5) # polar day
+        st.calc_sunrise_sunset(*dt5)
+        st.calc_sunrise_sunset(*dt1)
+        SunCache().equation(0, *pl1, 0)
+        stats = suntime.stats()
+        self.assertTrue(stats['enabled'])
+        self.assertEqual(stats['calls']['Suntime.calc_sunrise_sunset'], 3)
+        self.assertEqual(stats['calls']['Site.solve'], 3)
+        self.assertEqual(stats['calls']['jdate2time'], 6)
+        self.assertEqual(stats['calls']['equation'], 1)
+        self.assertEqual(stats['polar'], 3) # polar night at dt1 too
+        self.assertEqual(stats['redundant'], 1)
+        self.assertGreater(stats['ns']['Site.solve'], 0)
+        instrument.reset()
+        self.assertEqual(suntime.stats()['polar'], 0)
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,68 @@
+# test_noaa.py
+
+import unittest
+from tests import *
+
+from suntime import HORIZON, equation, jdate2time, noaa
+from suntime.cache import SunCache
+from suntime.suntime import Suntime, day2000
+
+GREENWICH = (51.4769, -0.0005)
+
+
+class TestNoaa(unittest.TestCase):
+
+    def minutes(self, solver, n, lat, lon):
+        Jr, Js = solver(n, lat, lon, 0)
+        return jdate2time(Jr, n), jdate2time(Js, n)
+
+    def test_reference(self):
+        # NOAA solar calculator, minutes since 00:00 UTC
+        self.assertEqual(self.minutes(noaa.equation, day2000(2000, 6, 21), *GREENWICH),
+                         (3*60 + 43, 20*60 + 21))
+        self.assertEqual(self.minutes(noaa.equation, day2000(2000, 12, 21), *GREENWICH),
+                         (8*60 + 3, 15*60 + 53))
+
+    def test_fast(self):
+        # models agree within 2 minutes at mid latitudes in 2000-2009; the
+        # fast one drifts later on, missing the precession of perihelion
+        for pl in (pl1, pl2, pl3, pl4):
+            for n in range(0, 3653, 11):
+                fast = self.minutes(equation, n, *pl)
+                accurate = self.minutes(noaa.equation, n, *pl)
+                self.assertLessEqual(abs(fast[0] - accurate[0]), 2)
+                self.assertLessEqual(abs(fast[1] - accurate[1]), 2)
+
+    def test_polar(self):
+        for pl, dt, sign in ((pl5, (2040, 8, 15), 1), (pl7, dt7, -1)):
+            Jr, Js = noaa.equation(day2000(*dt), *pl, 0)
+            self.assertAlmostEqual(Js - Jr, 2*sign)
+        # the fast model has still polar day at Svalbard
+        Jr, Js = noaa.equation(day2000(*dt5), *pl5, 0)
+        self.assertLess(Js - Jr, 1)
+
+    def test_solver(self):
+        cache = SunCache()
+        for st in (Suntime(*pl5, timezone=60, solver=noaa.equation),
+                   Suntime(*pl5, timezone=60, cache=cache, solver=noaa.equation)):
+            st.calc_sunrise_sunset(2040, 4, 10)
+            n = day2000(2040, 4, 10)
+            self.assertEqual((st.sunrise - 60, st.sunset - 60),
+                             self.minutes(noaa.equation, n, *pl5))
+            st.advance()
+            self.assertEqual((st.sunrise - 60, st.sunset - 60),
+                             self.minutes(noaa.equation, n + 1, *pl5))
+        Suntime(*pl5, cache=cache).calc_sunrise_sunset(2040, 4, 10)
+        self.assertEqual((cache.hits, cache.misses), (0, 3)) # one per solver
+
+    def test_calc_events(self):
+        # twilights use the default model even with another solver
+        st = Suntime(*GREENWICH, solver=noaa.equation, cache=SunCache())
+        st.calc_sunrise_sunset(2099, 6, 21)
+        self.assertEqual((st.sunrise, st.sunset), (223, 1221))
+        events = st.calc_events(2099, 6, 21, (HORIZON,))
+        self.assertEqual(events, [(223, 1220)])
+        self.assertEqual(events, Suntime(*GREENWICH).calc_events(2099, 6, 21, (HORIZON,)))
+
+if __name__ == '__main__':
+        unittest.main()
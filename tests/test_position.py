@@ -0,0 +1,81 @@
+# test_position.py
+
+import unittest
+from array import array
+from math import asin, degrees as deg
+from tests import *
+
+from suntime import HORIZON, equation
+from suntime.position import SolarPosition, transit
+from suntime.suntime import day2000
+
+# fixtures where Sun rises and sets
+DAYTIME = tuple(zip(PLACES[:4] + PLACES[7:], DATES[:4] + DATES[7:]))
+
+def seconds(Jd: float) -> float:
+    return (Jd - 2451544.5)*86400
+
+
+class TestSolarPosition(unittest.TestCase):
+
+    def test_transit(self):
+        # elevation at transit is 90° - |φ - δ|, azimuth is South or North
+        for pl, dt in DAYTIME:
+            n = day2000(*dt)
+            Jt, sinδ = transit(n, pl[1])
+            Jr, Js = equation(n, *pl, 0)
+            self.assertAlmostEqual(Jt, (Jr + Js)/2, places=9)
+            h, A = SolarPosition(*pl).at(seconds(Jt))
+            δ = deg(asin(sinδ))
+            self.assertAlmostEqual(h, 90 - abs(pl[0] - δ), places=6)
+            self.assertAlmostEqual(A, 180 if pl[0] > δ else 0, places=6)
+
+    def test_sunrise_sunset(self):
+        # elevation is `HORIZON` at the times given by `equation`; declination
+        # is interpolated rather than taken at transit, hence the tolerance
+        for pl, dt in DAYTIME:
+            Jr, Js = equation(day2000(*dt), *pl, 0)
+            position = SolarPosition(*pl)
+            h, A = position.at(seconds(Jr))
+            self.assertAlmostEqual(h, HORIZON, delta=0.2)
+            self.assertLess(A, 180)
+            h, A = position.at(seconds(Js))
+            self.assertAlmostEqual(h, HORIZON, delta=0.2)
+            self.assertGreater(A, 180)
+
+    def test_continuous(self):
+        # no jump when the cached terms move to the next day
+        position = SolarPosition(*pl1)
+        t0 = day2000(2025, 6, 21)*86400
+        last = position.at(t0)
+        for t in range(t0 + 60, t0 + 3*86400, 60):
+            h, A = position.at(t)
+            self.assertLess(abs(h - last[0]), 0.3)
+            last = h, A
+        self.assertEqual(position.n, day2000(2025, 6, 23))
+
+    def test_day(self):
+        position = SolarPosition(*pl1)
+        n = day2000(*dt1)
+        position.day(n + 1)
+        after = position.at(seconds(2451545.0 + n + 1))
+        position.day(n)
+        position.day(n + 1) # terms reused from the previous day
+        self.assertEqual(position.at(seconds(2451545.0 + n + 1)), after)
+
+    def test_at_array(self):
+        position = SolarPosition(*pl4)
+        n = day2000(*dt4)
+        times = array('d', range(n*86400 - 43200, n*86400 + 2*86400, 900))
+        elevation, azimuth = position.at_array(times)
+        self.assertEqual(len(elevation), len(times))
+        for i, t in enumerate(times):
+            self.assertEqual((elevation[i], azimuth[i]),
+                             SolarPosition(*pl4).at(t))
+        # buffers are reused
+        e, a = position.at_array(times[:4], elevation, azimuth)
+        self.assertIs(e, elevation)
+        self.assertIs(a, azimuth)
+
+if __name__ == '__main__':
+        unittest.main()
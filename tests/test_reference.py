@@ -0,0 +1,57 @@
+# test_reference.py
+
+import unittest
+from tests import *
+
+from suntime import jdate2time, noaa
+from tests import reference
+from tests.reference import DAYS, LATITUDES, LONGITUDES, load, places, run
+
+# solver: (max, mean) error in minutes for |latitude| ≤ 60°, a bit above
+# their current values; faster variants must not do worse
+BOUNDS = {
+    "equation": (6, 0.85),
+    "fixed": (6, 0.85),
+    "fast": (6, 0.85),
+}
+
+
+class TestReference(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = load()
+
+    def test_load(self):
+        self.assertEqual(len(self.data),
+                         2*len(LATITUDES)*len(LONGITUDES)*len(DAYS))
+
+    def test_generated(self):
+        # the dataset matches its generator (within rounding to the minute)
+        iterations = noaa.ITERATIONS
+        noaa.ITERATIONS = reference.ITERATIONS
+        try:
+            days = len(DAYS)
+            for i, (lat, lon) in enumerate(places()):
+                if i % 7:
+                    continue
+                for k in range(0, days, 13):
+                    n = DAYS[k]
+                    Jr, Js = noaa.equation(n, lat, lon, 0)
+                    self.assertLessEqual(abs(jdate2time(Jr, n)
+                        - self.data[2*days*i + k]), 1)
+                    self.assertLessEqual(abs(jdate2time(Js, n)
+                        - self.data[2*days*i + days + k]), 1)
+        finally:
+            noaa.ITERATIONS = iterations
+
+    def test_bounds(self):
+        report = run(60, BOUNDS)
+        for name, (worst, mean) in BOUNDS.items():
+            r = report["results"][name]
+            self.assertLessEqual(r["max"], worst, name)
+            self.assertLessEqual(r["mean"], mean, name)
+            self.assertEqual(r["polar"], 0, name)
+
+if __name__ == '__main__':
+        unittest.main()
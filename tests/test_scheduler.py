@@ -0,0 +1,98 @@
+# test_scheduler.py
+
+import asyncio
+import time
+import unittest
+from tests import *
+
+from suntime.cache import SunCache
+from suntime.scheduler import SUNRISE, SUNSET, Scheduler
+from suntime.suntime import Suntime, day2000
+
+def at(date, minutes, tz=0) -> int:
+    # seconds since 2000-01-01 00:00 UTC
+    return (day2000(*date)*1440 + minutes - tz)*60
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_run_pending(self):
+        t0 = at(dt1, 0, tz1[0]*60)
+        fired = []
+        scheduler = Scheduler(clock=lambda: t0)
+        rome = Suntime(*pl1)
+        scheduler.add(rome, SUNRISE, lambda s, e: fired.append((s, e)))
+        scheduler.add(rome, SUNSET, lambda s, e: fired.append((s, e)), -30)
+        sunrise = at(dt1, 7*60 + 40, tz1[0]*60)
+        sunset = at(dt1, 16*60 + 17, tz1[0]*60)
+        self.assertEqual(scheduler.run_pending(t0), sunrise - t0)
+        self.assertEqual(scheduler.run_pending(sunrise - 1), 1)
+        self.assertEqual(fired, [])
+        self.assertEqual(scheduler.run_pending(sunrise), sunset - sunrise)
+        self.assertEqual(fired, [(rome, SUNRISE)])
+        delay = scheduler.run_pending(sunset)
+        self.assertEqual(fired, [(rome, SUNRISE), (rome, SUNSET)])
+        self.assertEqual(len(scheduler), 2)
+        self.assertGreater(delay, 14*3600) # tomorrow's sunrise
+
+    def test_past(self):
+        # clocks before 2000 (negative seconds) are supported too
+        t0 = at((1999, 12, 31), 12*60, tz1[0]*60)
+        scheduler = Scheduler(clock=lambda: t0)
+        rome = Suntime(*pl1, timezone=tz1[0]*60)
+        scheduler.add(rome, SUNSET, lambda s, e: None)
+        rome.calc_sunrise_sunset(1999, 12, 31)
+        sunset = at((1999, 12, 31), rome.sunset, tz1[0]*60)
+        self.assertEqual(scheduler.run_pending(t0), sunset - t0)
+
+    def test_once_per_day(self):
+        cache = SunCache(0) # count computations
+        t0 = at(dt3, 0, tz3[0]*60)
+        scheduler = Scheduler(clock=lambda: t0)
+        site = Suntime(*pl3, cache=cache)
+        for offset in (-60, 0, 60):
+            scheduler.add(site, SUNRISE, lambda s, e: None, offset)
+            scheduler.add(site, SUNSET, lambda s, e: None, offset)
+        misses = cache.misses
+        t = t0
+        for _ in range(6*10):
+            t += scheduler.run_pending(t)
+        self.assertLessEqual(cache.misses - misses, 10 + 1)
+
+    def test_polar(self):
+        t0 = at(dt7, 12*60, (tz7[0] + tz7[1])*60)
+        scheduler = Scheduler(clock=lambda: t0)
+        scheduler.add(Suntime(*pl7), SUNRISE, lambda s, e: None)
+        st = Suntime(*pl7, timezone=tz7[0]*60)
+        days, minutes, _ = st.next_event(*dt7, 12*60, dst=tz7[1]*60)
+        self.assertEqual(scheduler.run_pending(t0),
+            at(dt7, days*1440 + minutes, (tz7[0] + tz7[1])*60) - t0)
+
+    def test_cancel(self):
+        t0 = at(dt1, 0)
+        fired = []
+        scheduler = Scheduler(clock=lambda: t0)
+        handle = scheduler.add(Suntime(*pl1), SUNRISE, lambda s, e: fired.append(e))
+        scheduler.cancel(handle)
+        self.assertIsNone(scheduler.run_pending(t0 + 86400))
+        self.assertEqual(fired, [])
+        self.assertRaises(ValueError, scheduler.add, Suntime(*pl1), 'noon', print)
+
+    def test_run(self):
+        sunrise = at(dt2, 7*60 + 16, (tz2[0] + tz2[1])*60)
+        start = time.monotonic()
+        clock = lambda: sunrise - 0.05 + time.monotonic() - start
+        fired = []
+
+        async def main():
+            scheduler = Scheduler(clock=clock)
+            scheduler.add(Suntime(*pl2), SUNRISE, lambda s, e: fired.append(e))
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0.3)
+            task.cancel()
+
+        asyncio.run(main())
+        self.assertEqual(fired, [SUNRISE])
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,95 @@
+# test_service.py
+
+import threading
+import time
+import unittest
+from tests import *
+
+from suntime import equation
+from suntime.service import SunService, SunTimes
+from suntime.suntime import Suntime
+
+def expected(pl, dt, tz) -> tuple:
+    st = Suntime(*pl, timezone=tz[0]*60)
+    st.calc_sunrise_sunset(*dt, dst=tz[1]*60)
+    return dt, st.sunrise, st.sunset
+
+
+class TestSunService(unittest.TestCase):
+
+    def test_query(self):
+        service = SunService()
+        for pl, dt, tz in zip(PLACES, DATES, TZS):
+            times = service.query(*pl, dt, timezone=tz[0]*60, dst=tz[1]*60)
+            self.assertIsInstance(times, SunTimes)
+            self.assertEqual(tuple(times), expected(pl, dt, tz))
+        self.assertRaises(AttributeError, setattr, times, 'sunrise', 0)
+        times = service.query(*pl1, dt1, timezone=60)
+        self.assertEqual(times.is_daytime(12*60), True)
+        self.assertEqual(times.is_nighttime(12*60), False)
+        self.assertIsNone(times.is_daytime(1440))
+        # other time zones share the computation
+        service.query(*pl1, dt1)
+        self.assertEqual((service.hits, service.misses), (2, 8))
+
+    def test_capacity(self):
+        service = SunService(2)
+        for n in range(3):
+            service.equation(n, *pl1)
+        self.assertEqual(len(service), 2)
+        service.equation(0, *pl1)
+        self.assertEqual(service.misses, 4)
+        service.clear()
+        self.assertEqual((len(service), service.hits, service.misses), (0, 0, 0))
+
+    def test_coalesce(self):
+        calls = []
+        def solver(*args):
+            calls.append(args)
+            time.sleep(0.2)
+            return equation(*args)
+        service = SunService(solver=solver)
+        barrier = threading.Barrier(16)
+        results = []
+        def worker():
+            barrier.wait()
+            results.append(service.query(*pl1, dt1))
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(service.misses, 1)
+        self.assertEqual(service.hits + service.coalesced, 15)
+        self.assertEqual(len(set(results)), 1)
+
+    def test_error(self):
+        def solver(*args):
+            raise ValueError
+        service = SunService(solver=solver)
+        self.assertRaises(ValueError, service.query, *pl1, dt1)
+        self.assertEqual((len(service), len(service._pending)), (0, 0))
+
+    def test_stress(self):
+        # many threads hammering a shared service, each query 8 times
+        dates = [(2025, m, d) for m in range(1, 13) for d in (1, 8, 15, 22)]
+        queries = [(*pl, dt, 0, tz[0]*60, tz[1]*60)
+                   for dt in dates for pl, tz in zip(PLACES, TZS)]
+        with SunService(max_workers=32) as service:
+            t0 = time.perf_counter()
+            results = service.query_many(queries*8)
+            elapsed = time.perf_counter() - t0
+        self.assertLess(elapsed, 10)
+        self.assertEqual(len(results), 8*len(queries))
+        for (*pl, dt, _, tz, dst), r in zip(queries*8, results):
+            st = Suntime(*pl, timezone=tz)
+            st.calc_sunrise_sunset(*dt, dst=dst)
+            self.assertEqual(tuple(r), (dt, st.sunrise, st.sunset))
+        # pl6 and pl8 are the same places as pl5 and pl7
+        self.assertEqual(service.misses, len(dates)*6)
+        self.assertEqual(service.hits + service.misses + service.coalesced,
+                         len(results))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -0,0 +1,63 @@
+# test_siteset.py
+
+import unittest
+from tests import *
+
+from suntime.siteset import SiteSet
+from suntime.suntime import Suntime
+
+# pl6 and pl8 are the same places as pl5 and pl7
+SITES = tuple(zip(PLACES[:5] + PLACES[6:7], TZS[:5] + TZS[6:7]))
+
+
+class TestSiteSet(unittest.TestCase):
+
+    def setUp(self):
+        self.sites = SiteSet()
+        for pl, tz in SITES:
+            self.sites.add(*pl, timezone=tz[0]*60)
+
+    def test_add(self):
+        sites = self.sites
+        self.assertEqual(len(sites), len(SITES))
+        self.assertEqual(sites.add(0, 0, 100), len(SITES))
+        self.assertEqual(sum(c.itemsize for c in (sites.latitude, sites.longitude,
+            sites.altitude, sites.timezone, sites.sunrise, sites.sunset)), 24)
+
+    def test_calc_sunrise_sunset(self):
+        for date in (dt1, dt3, dt5, dt7):
+            self.sites.calc_sunrise_sunset(*date, dst=60)
+            for i, (pl, tz) in enumerate(SITES):
+                st = Suntime(*pl, timezone=tz[0]*60)
+                st.calc_sunrise_sunset(*date, dst=60)
+                self.assertEqual((self.sites.sunrise[i], self.sites.sunset[i]),
+                                 (st.sunrise, st.sunset))
+
+    def test_is_daytime(self):
+        sites = self.sites
+        sites.calc_sunrise_sunset(*dt5)
+        for minutes in range(0, 1440, 10):
+            day = sites.is_daytime(None, minutes)
+            night = sites.is_nighttime([0, 4], minutes)
+            self.assertEqual(list(night), [1 - day[0], 1 - day[4]])
+            for i, (pl, tz) in enumerate(SITES):
+                st = Suntime(*pl, timezone=tz[0]*60)
+                st.calc_sunrise_sunset(*dt5)
+                self.assertEqual(bool(day[i]), st.is_daytime(minutes), (i, minutes))
+        self.assertEqual(sites.is_daytime([4], 0), bytearray([1])) # polar day
+
+    def test_is_daytime_offset(self):
+        # pl2 is at UTC-8: 00:40 UTC is 17:40 local, Sun still up
+        sites = self.sites
+        sites.calc_sunrise_sunset(*dt2, dst=60)
+        st = Suntime(*pl2, timezone=tz2[0]*60)
+        st.calc_sunrise_sunset(*dt2, dst=60)
+        self.assertEqual(sites.is_daytime([1], 17*60 + 40), bytearray([1]))
+        self.assertTrue(st.is_daytime(17*60 + 40))
+        self.assertEqual(sites.is_nighttime([1], 23*60), bytearray([1]))
+        for minutes in (-1, 1440, 24*60 + 40):
+            self.assertIsNone(sites.is_daytime([1], minutes))
+            self.assertIsNone(sites.is_nighttime(None, minutes))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -4,7 +4,9 @@ import unittest
 from datetime import datetime, timedelta, timezone
 from tests import *
 
-from suntime.sundatetime import Sundatetime
+import suntime
+from suntime import NORMAL, POLAR_NIGHT, instrument
+from suntime.sundatetime import OffsetTable, Sundatetime, iter_sun_events
 
 class Tz(timezone):
     def __init__(self, hours: int, dst: int=0) -> None:
@@ -25,6 +27,27 @@ class Tz(timezone):
     def isdst(self, dt: datetime) -> bool:
         return self._dst != 0
 
+class Cet(Tz):
+    # CET/CEST, switching on the last Sundays of March and October at 01:00 UTC
+    def __init__(self) -> None:
+        super().__init__(1, 1)
+
+    def isdst(self, dt: datetime, utc: bool=False) -> bool:
+        year = dt.year
+        hour = 1 if utc else 2
+        beg = datetime(year, 3, 31 - (5*year//4 + 4)%7, hour)
+        end = datetime(year, 10, 31 - (5*year//4 + 1)%7, hour if utc else 3)
+        naive = dt.replace(tzinfo=None)
+        if not utc and dt.fold and end - timedelta(hours=1) <= naive:
+            return False # second 02:00-03:00 in October
+        return beg <= naive < end
+
+    def fromutc(self, dt: datetime) -> datetime:
+        assert dt.tzinfo is self
+        fold = int(not self.isdst(dt, True) and self.isdst(dt - timedelta(hours=1), True))
+        dt += timedelta(hours=2 if self.isdst(dt, True) else 1)
+        return dt.replace(fold=fold)
+
 
 class TestSunDatetime(unittest.TestCase):
 
@@ -110,5 +133,76 @@ class TestSunDatetime(unittest.TestCase):
         self.assertTrue (sd8.is_sunrise  (datetime(2033, 10, 21,  3,  6, 0, 0, tz)))
         self.assertTrue (sd8.is_sunset   (datetime(2033, 10, 22,  0, 12, 0, 0, tz)))
 
+    def test_iter_sun_events(self):
+        tz = Tz(tz1[0])
+        sd = Sundatetime(*pl1)
+        start = datetime(2000, 12, 30, tzinfo=tz)
+        end = datetime(2001, 1, 2, tzinfo=tz)
+        events = list(iter_sun_events(*pl1, 0, start, end))
+        self.assertEqual([e[0].tuple()[:3] for e in events],
+            [(2000, 12, 30), (2000, 12, 31), (2001, 1, 1), (2001, 1, 2)])
+        for date, sunrise, sunset in events:
+            sd.calc_sunrise_sunset(date)
+            self.assertEqual(sunrise, sd.sunrise)
+            self.assertEqual(sunset, sd.sunset)
+
+    def test_offsets(self):
+        for tz in (Tz(tz2[0], tz2[1]), Cet()):
+            start = datetime(2021, 1, 1, tzinfo=tz)
+            end = datetime(2022, 12, 31, tzinfo=tz)
+            self.assertEqual(list(iter_sun_events(*pl1, 0, start, end, offsets=True)),
+                             list(iter_sun_events(*pl1, 0, start, end)))
+        table = OffsetTable(tz, 2021)
+        self.assertEqual(list(table.offsets), [60, 120, 60])
+        for minutes in range(table.times[2] - 120, table.times[2] + 120):
+            dt = table.datetime(minutes)
+            self.assertEqual(table.offset(minutes), dt.utcoffset().total_seconds()//60)
+        sd = Sundatetime(*pl1, offsets=True)
+        sd.calc_sunrise_sunset(datetime(*dt4, tzinfo=tz))
+        self.assertEqual(sd.sunrise.tuple(), (2021, 4, 24, 6, 15, 0, 0, tz, 0))
+
+    def test_events(self):
+        tz = Tz(tz1[0])
+        sd1 = Sundatetime(*pl1)
+        now = datetime(2000, 1, 1, 12, 0, 0, 0, tz)
+        dt, rising = sd1.next_event(now)
+        self.assertEqual(dt.tuple(), (2000, 1, 1, 16, 47, 0, 0, tz, 0))
+        self.assertFalse(rising)
+        dt, rising = sd1.previous_event(now)
+        self.assertEqual(dt.tuple(), (2000, 1, 1,  7, 40, 0, 0, tz, 0))
+        self.assertTrue(rising)
+
+    def test_events_polar(self):
+        tz = Tz(tz7[0], tz7[1])
+        sd7 = Sundatetime(*pl7)
+        dt, rising = sd7.next_event(datetime(*dt7, 12, 0, 0, 0, tz))
+        self.assertEqual(dt.tuple(), (2033, 8, 19, 12, 24, 0, 0, tz, 0))
+        self.assertTrue(rising)
+
+    def test_polar_span(self):
+        sd7 = Sundatetime(*pl7)
+        sd7.calc_sunrise_sunset(datetime(*dt7, tzinfo=Tz(tz7[0], tz7[1])))
+        self.assertEqual(sd7.state, POLAR_NIGHT)
+        first, last = sd7.polar_span()
+        self.assertEqual(last.timetuple()[:3], (2033, 8, 18))
+        sd7.calc_sunrise_sunset(datetime(*dt8, tzinfo=Tz(tz8[0], tz8[1])))
+        self.assertEqual(sd7.state, NORMAL)
+        self.assertIsNone(sd7.polar_span())
+
+    def test_instrument(self):
+        # `datetime` results are built by `_minutes2datetime` when read
+        instrument.enable()
+        try:
+            sd = Sundatetime(*pl1)
+            sd.calc_sunrise_sunset(datetime(*dt1, tzinfo=Tz(*tz1)))
+            self.assertNotIn('_minutes2datetime', suntime.stats()['calls'])
+            sd.sunrise
+            sd.sunset
+            sd.sunrise
+            self.assertEqual(suntime.stats()['calls']['_minutes2datetime'], 2)
+        finally:
+            instrument.disable()
+            instrument.reset()
+
 if __name__ == '__main__':
         unittest.main()
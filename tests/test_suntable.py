@@ -0,0 +1,70 @@
+# test_suntable.py
+
+import unittest
+from tests import *
+
+from suntime.suntime import Suntime, day2000
+from suntime.suntable import SunTable
+
+
+class TestSunTable(unittest.TestCase):
+
+    def test_year(self):
+        tb = SunTable.year(*pl2, timezone=tz2[0]*60, year=dt2[0])
+        self.assertEqual(len(tb), 365)
+        st = Suntime(*pl2, timezone=tz2[0]*60)
+        for month, day in ((1, 1), (dt2[1], dt2[2]), (12, 31)):
+            st.calc_sunrise_sunset(dt2[0], month, day)
+            self.assertEqual(tb.lookup(day2000(dt2[0], month, day)),
+                             (st.sunrise, st.sunset))
+
+    def test_polar(self):
+        tb = SunTable.year(*pl7, timezone=tz7[0]*60, year=dt7[0])
+        sunrise, sunset = tb.lookup(day2000(*dt7))
+        self.assertEqual(divmod(sunrise + tz7[1]*60, 60), ( 37, 0))
+        self.assertEqual(divmod(sunset  + tz7[1]*60, 60), (-11, 0))
+
+    def test_leap_year(self):
+        self.assertEqual(len(SunTable.year(*pl1, year=2000)), 366)
+        self.assertEqual(len(SunTable.year(*pl1, year=2099)), 365)
+
+    def test_lookup_range(self):
+        tb = SunTable.year(*pl1, year=2001)
+        self.assertIn(day2000(2001, 1, 1), tb)
+        self.assertNotIn(day2000(2002, 1, 1), tb)
+        self.assertRaises(IndexError, tb.lookup, day2000(2000, 12, 31))
+
+    def test_century(self):
+        tb = SunTable(*pl1, timezone=tz1[0]*60)
+        self.assertEqual(len(tb), 36525)
+        self.assertLess(len(tb.to_bytes()), 146_200)
+        self.assertEqual(tb.lookup(day2000(*dt1)), (7*60 + 40, 16*60 + 47))
+
+    def test_bytes(self):
+        tb = SunTable.year(*pl3, timezone=tz3[0]*60, year=dt3[0])
+        blob = tb.to_bytes()
+        tb2 = SunTable.from_bytes(blob)
+        self.assertEqual((tb2.latitude, tb2.longitude), pl3)
+        self.assertEqual(tb2.timezone, tz3[0]*60)
+        self.assertEqual(tb2.first, tb.first)
+        self.assertEqual(list(tb2.sunrise), list(tb.sunrise))
+        self.assertEqual(list(tb2.sunset ), list(tb.sunset ))
+
+    def test_bytes_range(self):
+        tb = SunTable(*pl3, timezone=tz3[0]*60, first=0, days=1000)
+        tb2 = SunTable.from_bytes(tb.to_bytes(), first=500, days=10)
+        self.assertEqual(len(tb2), 10)
+        self.assertEqual(tb2.lookup(505), tb.lookup(505))
+        self.assertRaises(IndexError, SunTable.from_bytes, tb.to_bytes(), 995, 10)
+        self.assertRaises(ValueError, SunTable.from_bytes, b'XXXX' + tb.to_bytes()[4:])
+
+    def test_bytes_past(self):
+        for year in (1600, 1999, 2250, 2399):
+            tb = SunTable.year(60, 10, year=year)
+            tb2 = SunTable.from_bytes(tb.to_bytes())
+            self.assertEqual(tb2.first, day2000(year, 1, 1))
+            self.assertEqual(list(tb2.sunrise), list(tb.sunrise))
+            self.assertEqual(list(tb2.sunset ), list(tb.sunset ))
+
+if __name__ == '__main__':
+        unittest.main()
@@ -3,7 +3,11 @@
 import unittest
 from tests import *
 
-from suntime.suntime import Suntime
+from suntime import CIVIL, FIRST_DAY, HORIZON, LAST_DAY, NORMAL, POLAR_DAY,\
+                    POLAR_NIGHT, Site, day_state, equation, equation_angles,\
+                    jdate2time, polar_span
+from suntime.cache import SunCache
+from suntime.suntime import Suntime, day2000, iter_sun_events, julian_day
 
 
 class TestSunTime(unittest.TestCase):
@@ -102,5 +106,215 @@ class TestSunTime(unittest.TestCase):
         self.assertTrue (st8.is_sunrise  ( 3*60 +  6))
         self.assertFalse(st8.is_sunset   (24*60 + 12))
 
+
+class TestSite(unittest.TestCase):
+
+    def test_site(self):
+        for pl, dt in zip(PLACES, DATES):
+            for alt in (0, 100, 3000):
+                n = day2000(*dt)
+                site = Site(*pl, alt)
+                site.solve(n)
+                self.assertEqual((site.Jr, site.Js), equation(n, *pl, alt))
+
+class TestIterSunEvents(unittest.TestCase):
+
+    def test_iter_sun_events(self):
+        tz = tz1[0]*60
+        st = Suntime(*pl1, timezone=tz)
+        events = list(iter_sun_events(*pl1, 0, (2000, 2, 27), (2001, 1, 2), tz))
+        self.assertEqual(len(events), day2000(2001, 1, 2) - day2000(2000, 2, 27) + 1)
+        self.assertEqual([e[0] for e in events[:4]],
+            [(2000, 2, 27), (2000, 2, 28), (2000, 2, 29), (2000, 3, 1)])
+        self.assertEqual([e[0] for e in events[-3:]],
+            [(2000, 12, 31), (2001, 1, 1), (2001, 1, 2)])
+        for date, sunrise, sunset in events:
+            st.calc_sunrise_sunset(*date)
+            self.assertEqual((sunrise, sunset), (st.sunrise, st.sunset))
+
+    def test_iter_sun_events_non_leap(self):
+        dates = [e[0] for e in iter_sun_events(*pl5, 0, (2041, 2, 28), (2041, 3, 1))]
+        self.assertEqual(dates, [(2041, 2, 28), (2041, 3, 1)])
+
+    def test_iter_sun_events_empty(self):
+        self.assertEqual(list(iter_sun_events(*pl5, 0, dt6, dt5)), [])
+
+class TestEvents(unittest.TestCase):
+
+    def scan(self, st, dt, minutes, tz, step):
+        # Reference: check day by day.
+        n0 = day2000(*dt)
+        now = n0*1440 + minutes
+        n = n0 - step
+        while FIRST_DAY <= n < LAST_DAY:
+            Jr, Js = equation(n, st.latitude, st.longitude, st.altitude)
+            if Js - Jr < 1.5 and Jr < Js:
+                events = [(n*1440 + jdate2time(Jr, n, tz), True),
+                          (n*1440 + jdate2time(Js, n, tz), False)]
+                for t, rising in events if step > 0 else events[::-1]:
+                    if (t > now) if step > 0 else (t <= now):
+                        days, minutes = divmod(t, 1440)
+                        return days - n0, minutes, rising
+            n += step
+        return None
+
+    def test_events(self):
+        st = Suntime(*pl1, timezone=tz1[0]*60)
+        self.assertEqual(st.next_event    (*dt1,  0), (0,  7*60 + 40, True ))
+        self.assertEqual(st.next_event    (*dt1, 7*60 + 40), (0, 16*60 + 47, False))
+        self.assertEqual(st.previous_event(*dt1, 7*60 + 40), (0,  7*60 + 40, True ))
+        self.assertEqual(st.previous_event(2000, 1, 2, 7*60 + 39), (-1, 16*60 + 47, False))
+        self.assertEqual(st.next_event    (*dt1, 23*60)[:2], (1, 7*60 + 40))
+
+    def test_events_fixtures(self):
+        for pl, dt, tz in zip(PLACES, DATES, TZS):
+            st = Suntime(*pl, timezone=tz[0]*60)
+            for minutes in (0, 12*60, 23*60 + 59):
+                for step in (1, -1):
+                    event = (st.next_event if step > 0 else st.previous_event)\
+                            (*dt, minutes, dst=tz[1]*60)
+                    self.assertEqual(event,
+                        self.scan(st, dt, minutes, (tz[0] + tz[1])*60, step))
+
+    def test_events_polar(self):
+        cache = SunCache(0) # count calls to `equation`
+        st7 = Suntime(*pl7, timezone=tz7[0]*60, cache=cache)
+        days, minutes, rising = st7.next_event(*dt7, 12*60, dst=tz7[1]*60)
+        self.assertTrue(rising)
+        self.assertGreater(days, 0)
+        self.assertEqual((days, minutes, rising),
+                         self.scan(st7, dt7, 12*60, (tz7[0] + tz7[1])*60, 1))
+        self.assertLess(cache.misses, 30)
+        st5 = Suntime(*pl5, timezone=tz5[0]*60, cache=cache)
+        event = st5.previous_event(*dt5, 0, dst=tz5[1]*60)
+        self.assertLess(event[0], -100)
+        self.assertEqual(event,
+                         self.scan(st5, dt5, 0, (tz5[0] + tz5[1])*60, -1))
+        self.assertLess(cache.misses, 60)
+
+    def test_events_range(self):
+        st = Suntime(*pl1)
+        self.assertIsNone(st.previous_event(1600, 1, 1, 0))
+        self.assertIsNone(st.next_event(2399, 12, 31, 23*60 + 59))
+
+class TestAngles(unittest.TestCase):
+
+    def test_horizon(self):
+        for pl, dt in zip(PLACES, DATES):
+            for alt in (0, 500):
+                n = day2000(*dt)
+                self.assertEqual(equation_angles(n, *pl, alt, (HORIZON,)),
+                                 [equation(n, *pl, alt)])
+
+    def test_calc_events(self):
+        st = Suntime(*pl1, timezone=tz1[0]*60)
+        events = st.calc_events(*dt1)
+        self.assertEqual(len(events), 4)
+        self.assertEqual(events[0], (7*60 + 40, 16*60 + 47))
+        for (r0, s0), (r1, s1) in zip(events, events[1:]):
+            self.assertLess(r1, r0)
+            self.assertGreater(s1, s0)
+        self.assertEqual(divmod(events[1][0], 60), (7, 8)) # civil dawn
+
+    def test_calc_events_polar(self):
+        st = Suntime(*pl7, timezone=tz7[0]*60)
+        (r0, s0), (r1, s1) = st.calc_events(*dt7, (HORIZON, CIVIL), tz7[1]*60)
+        self.assertGreater(r0, s0) # Sun down all day
+        self.assertLess(r1, s1)    # but civil twilight
+
+class TestAdvance(unittest.TestCase):
+
+    def test_advance(self):
+        st = Suntime(*pl1, timezone=tz1[0]*60)
+        st.calc_sunrise_sunset(*dt1)
+        st.advance()
+        self.assertEqual(st.n, 1)
+        self.assertEqual((st.sunrise, st.sunset), (7*60 + 40, 16*60 + 48))
+        st.advance(-1, dst=60)
+        self.assertEqual((st.sunrise, st.sunset), (8*60 + 40, 17*60 + 47))
+
+    def test_century(self):
+        for pl, tz in zip(PLACES, TZS):
+            tz = tz[0]*60
+            st = Suntime(*pl, timezone=tz)
+            st.calc_sunrise_sunset(2000, 1, 1)
+            for n in range(1, 36525):
+                st.advance()
+                Jr, Js = equation(n, *pl, 0)
+                self.assertEqual((st.sunrise, st.sunset),
+                                 (jdate2time(Jr, n, tz), jdate2time(Js, n, tz)))
+
+class TestRange(unittest.TestCase):
+
+    def test_julian_day(self):
+        self.assertEqual(julian_day(2000,  1,  1), 2451545)
+        self.assertEqual(julian_day(1970,  1,  1), 2440588)
+        self.assertEqual(julian_day(1858, 11, 17), 2400001)
+        self.assertEqual(julian_day(1600,  1,  1), 2305448)
+
+    def test_day2000(self):
+        self.assertEqual(day2000(1999, 12, 31), -1)
+        self.assertEqual(day2000(1600,  1,  1), FIRST_DAY)
+        self.assertEqual(day2000(2100,  1,  1), 36525)
+        for year in range(2000, 2100, 7):
+            for month in range(1, 13):
+                self.assertEqual(day2000(year, month, 28),
+                                 julian_day(year, month, 28) - 2451545)
+
+    def test_past(self):
+        st = Suntime(*pl1, timezone=tz1[0]*60)
+        events = list(iter_sun_events(*pl1, 0, (1999, 12, 30), (2000, 1, 1), 60))
+        self.assertEqual([e[0] for e in events],
+                         [(1999, 12, 30), (1999, 12, 31), (2000, 1, 1)])
+        for date, sunrise, sunset in events:
+            st.calc_sunrise_sunset(*date)
+            self.assertEqual((st.sunrise, st.sunset), (sunrise, sunset))
+        dates = [e[0] for e in iter_sun_events(*pl1, 0, (1900, 2, 28), (1900, 3, 1))]
+        self.assertEqual(dates, [(1900, 2, 28), (1900, 3, 1)])
+        st.calc_sunrise_sunset(1955, 6, 21)
+        self.assertEqual(divmod(st.sunrise, 60), (4, 33))
+        self.assertEqual(divmod(st.sunset , 60), (19, 51))
+
+class TestPolar(unittest.TestCase):
+
+    def test_state(self):
+        for pl, dt, state in ((pl1, dt1, NORMAL), (pl5, dt5, POLAR_DAY),
+                              (pl6, dt6, NORMAL), (pl7, dt7, POLAR_NIGHT)):
+            st = Suntime(*pl)
+            st.calc_sunrise_sunset(*dt)
+            self.assertEqual(st.state, state)
+            self.assertEqual(day_state(*equation(day2000(*dt), *pl, 0)), state)
+            for minutes in (0, 720, 1439):
+                self.assertEqual(st.is_daytime(minutes),
+                    st.sunrise <= minutes < st.sunset)
+        st.advance()
+        self.assertEqual(st.state, POLAR_NIGHT)
+
+    def test_polar_span(self):
+        solve = lambda n: equation(n, *pl5, 0)
+        self.assertIsNone(polar_span(solve, day2000(*dt6)))
+        first, last = polar_span(solve, day2000(*dt5))
+        self.assertEqual(last, day2000(*dt5))
+        self.assertEqual((day_state(*solve(first - 1)), day_state(*solve(first))),
+                         (NORMAL, POLAR_DAY))
+        self.assertEqual(polar_span(solve, first), (first, last))
+        # a whole polar night, computed once for all of its days
+        calls = []
+        def solver(*args):
+            calls.append(args)
+            return equation(*args)
+        st = Suntime(*pl7, solver=solver)
+        st.calc_sunrise_sunset(*dt7)
+        first, last = st.polar_span()
+        self.assertTrue(first < day2000(*dt7) < last)
+        del calls[:]
+        for _ in range(last - st.n):
+            st.advance()
+            self.assertEqual(st.polar_span(), (first, last))
+        self.assertEqual(len(calls), last - day2000(*dt7))
+        st.advance()
+        self.assertEqual(st.state, NORMAL)
+        self.assertIsNone(st.polar_span())
+
 if __name__ == '__main__':
         unittest.main()